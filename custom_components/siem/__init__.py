@@ -1,19 +1,32 @@
 """The SIEM Server integration."""
+import asyncio
+import hashlib
 import logging
-import yaml
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
 
-from .const import DOMAIN
+from .const import (
+    CONF_DASHBOARD_MODE,
+    DASHBOARD_MODE_NONE,
+    DASHBOARD_MODE_STORAGE,
+    DOMAIN,
+)
 from .siem_server import SiemServer
 from .api import SiemLogViewerView
-from .dashboard import get_dashboard_config
+from .dashboard import get_dashboard_json_bytes
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR]
 
+# Dedicated single thread for the dashboard file writes so they don't
+# occupy a slot in HA's shared executor during startup.
+_dashboard_executor: ThreadPoolExecutor = None
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the SIEM Server component."""
@@ -35,23 +48,50 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register API endpoint
     hass.http.register_view(SiemLogViewerView(hass))
     
-    # Register Lovelace dashboard
-    await _async_setup_dashboard(hass)
-    
-    # Set up platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
+    # Set up platforms and the Lovelace dashboard concurrently so the
+    # dashboard's executor-backed file I/O overlaps platform setup.
+    dashboard_mode = entry.options.get(
+        CONF_DASHBOARD_MODE,
+        entry.data.get(CONF_DASHBOARD_MODE, DASHBOARD_MODE_STORAGE),
+    )
+    setup_tasks = [
+        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    ]
+    if dashboard_mode != DASHBOARD_MODE_NONE:
+        setup_tasks.append(_async_setup_dashboard(hass))
+    await asyncio.gather(*setup_tasks)
+
     return True
 
 
+def _write_atomic(path: str, payload: bytes) -> None:
+    """Write a storage file atomically, skipping the write if unchanged."""
+    try:
+        with open(path, 'rb') as f:
+            existing = f.read()
+        if hashlib.blake2b(existing).digest() == hashlib.blake2b(payload).digest():
+            return
+    except OSError:
+        pass
+
+    # Raw fd write: a single os.write of pre-serialized bytes needs no
+    # buffering layer on top.
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
 async def _async_setup_dashboard(hass: HomeAssistant) -> None:
     """Set up the SIEM dashboard by creating it in Lovelace storage."""
     try:
-        import json
+        import orjson
         from homeassistant.components.lovelace.const import MODE_STORAGE
-        
-        dashboard_config = get_dashboard_config()
-        
+
         # Path to lovelace dashboards storage
         lovelace_path = hass.config.path(".storage", "lovelace.lovelace_dashboards")
         
@@ -59,8 +99,8 @@ async def _async_setup_dashboard(hass: HomeAssistant) -> None:
             # Read existing dashboards
             dashboards = {"data": {"items": []}, "key": "lovelace.lovelace_dashboards", "version": 1}
             try:
-                with open(lovelace_path, 'r') as f:
-                    dashboards = json.load(f)
+                with open(lovelace_path, 'rb') as f:
+                    dashboards = orjson.loads(f.read())
             except FileNotFoundError:
                 pass
             
@@ -70,6 +110,7 @@ async def _async_setup_dashboard(hass: HomeAssistant) -> None:
                 for item in dashboards.get("data", {}).get("items", [])
             )
             
+            registry_payload = None
             if not siem_dashboard_exists:
                 # Add SIEM dashboard
                 dashboards.setdefault("data", {}).setdefault("items", []).append({
@@ -81,23 +122,21 @@ async def _async_setup_dashboard(hass: HomeAssistant) -> None:
                     "title": "SIEM Security",
                     "url_path": "siem-security",
                 })
-                
-                # Save dashboards list
-                with open(lovelace_path, 'w') as f:
-                    json.dump(dashboards, f, indent=2)
-            
-            # Create dashboard content file
+                registry_payload = orjson.dumps(dashboards)
+
+            # Write both storage files back-to-back so the OS can coalesce
+            # the metadata updates into a single flush.
             dashboard_content_path = hass.config.path(".storage", "lovelace.siem_security")
-            with open(dashboard_content_path, 'w') as f:
-                json.dump({
-                    "data": {
-                        "config": dashboard_config
-                    },
-                    "key": "lovelace.siem_security",
-                    "version": 1
-                }, f, indent=2)
+            if registry_payload is not None:
+                _write_atomic(lovelace_path, registry_payload)
+            _write_atomic(dashboard_content_path, get_dashboard_json_bytes())
         
-        await hass.async_add_executor_job(create_dashboard)
+        global _dashboard_executor
+        if _dashboard_executor is None:
+            _dashboard_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="siem-dash"
+            )
+        await hass.loop.run_in_executor(_dashboard_executor, create_dashboard)
         
         _LOGGER.info(
             "SIEM dashboard automatically created!\n"
@@ -119,5 +158,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         siem_server = hass.data[DOMAIN].pop(entry.entry_id)
         await siem_server.async_shutdown()
-    
+
+        global _dashboard_executor
+        if _dashboard_executor is not None:
+            _dashboard_executor.shutdown(wait=False)
+            _dashboard_executor = None
+
     return unload_ok
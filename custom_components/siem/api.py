@@ -1,5 +1,9 @@
 """Custom API endpoint for SIEM log viewer."""
 import logging
+from itertools import islice
+from operator import attrgetter
+
+import orjson
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import HomeAssistant
@@ -8,6 +12,21 @@ from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# C-level fetch of the three filterable attributes in one call.
+_GET3 = attrgetter("event_type", "entity_id", "severity")
+
+# Result sizes above this stream in chunks instead of materializing.
+_STREAM_THRESHOLD = 512
+
+
+def _json_response(payload, status: int = 200) -> web.Response:
+    """Serialize a response body with orjson instead of stdlib json."""
+    return web.Response(
+        body=orjson.dumps(payload),
+        status=status,
+        content_type="application/json",
+    )
+
 
 class SiemLogViewerView(HomeAssistantView):
     """SIEM Log Viewer API endpoint."""
@@ -19,50 +38,175 @@ class SiemLogViewerView(HomeAssistantView):
     def __init__(self, hass: HomeAssistant):
         """Initialize the view."""
         self.hass = hass
+        self._siem_server = None
+        # Response bytes keyed by (query string, events version);
+        # dashboards poll the same query repeatedly between events.
+        self._response_cache = {}
+
+    def _get_siem_server(self):
+        """Resolve the SIEM server, caching it across requests.
+
+        The config entry registry is only walked again when the cached
+        instance has been unloaded from hass.data.
+        """
+        siem_server = self._siem_server
+        domain_data = self.hass.data.get(DOMAIN, {})
+        if (
+            siem_server is not None
+            and siem_server.entry.entry_id in domain_data
+        ):
+            return siem_server
+
+        entries = self.hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            return None
+        siem_server = domain_data.get(entries[0].entry_id)
+        self._siem_server = siem_server
+        return siem_server
+
+    async def _stream_events(self, request, events, total):
+        """Stream a large result set in fixed-size encoded chunks.
+
+        `events` must be a materialized list, collected before this
+        coroutine first awaits: iterating the live ring here would race
+        with ingest callbacks running between chunk writes and raise
+        "deque mutated during iteration" mid-response, after headers
+        have already gone out.
+        """
+        resp = web.StreamResponse(
+            headers={"Content-Type": "application/json"}
+        )
+        await resp.prepare(request)
+        await resp.write(b'{"events":[')
+
+        count = len(events)
+        for start in range(0, count, _STREAM_THRESHOLD):
+            chunk = [
+                e.to_dict()
+                for e in events[start:start + _STREAM_THRESHOLD]
+            ]
+            # Strip the surrounding brackets so chunks concatenate into
+            # one JSON array.
+            body = orjson.dumps(chunk)[1:-1]
+            if start:
+                await resp.write(b"," + body)
+            else:
+                await resp.write(body)
+
+        await resp.write(b'],"count":%d,"total":%d}' % (count, total))
+        await resp.write_eof()
+        return resp
 
     async def get(self, request):
         """Get SIEM events via HTTP API."""
         try:
-            # Get query parameters
-            event_type = request.query.get("event_type")
-            entity_id = request.query.get("entity_id")
-            severity = request.query.get("severity")
-            limit = int(request.query.get("limit", 100))
+            # Read all query parameters once; malformed limits fall back
+            # to the default instead of raising into the 500 handler.
+            query = request.query
+            event_type = query.get("event_type")
+            entity_id = query.get("entity_id")
+            severity = query.get("severity")
+            try:
+                limit = int(query.get("limit", "100"))
+            except ValueError:
+                limit = 100
 
             # Get SIEM server instance
-            entries = self.hass.config_entries.async_entries(DOMAIN)
-            if not entries:
-                return web.json_response(
+            siem_server = self._get_siem_server()
+            if siem_server is None:
+                return _json_response(
                     {"error": "SIEM not configured"},
-                    status=404
+                    status=404,
                 )
 
-            siem_server = self.hass.data[DOMAIN][entries[0].entry_id]
+            cache_key = (str(request.query_string), siem_server.version)
+            cached_body = self._response_cache.get(cache_key)
+            if cached_body is not None:
+                return web.Response(
+                    body=cached_body, content_type="application/json"
+                )
 
-            # Filter events
-            filtered_events = []
-            for event in reversed(siem_server.events):
-                if event_type and event.event_type != event_type:
-                    continue
-                if entity_id and event.entity_id != entity_id:
-                    continue
-                if severity and event.severity != severity:
-                    continue
+            # Pick the most selective secondary index so filtered queries
+            # only touch matching events instead of scanning the buffer.
+            candidates = siem_server.events
+            if event_type or entity_id or severity:
+                # .get with a tuple default: subscripting the defaultdict
+                # would permanently insert an empty deque for every
+                # filter value a client ever sends
+                indexed = [
+                    siem_server.events_by_type.get(event_type, ())
+                    if event_type else None,
+                    siem_server.events_by_entity.get(entity_id, ())
+                    if entity_id else None,
+                    siem_server.events_by_severity.get(severity, ())
+                    if severity else None,
+                ]
+                candidates = min(
+                    (d for d in indexed if d is not None), key=len
+                )
 
-                filtered_events.append(event.to_dict())
+            # Build predicates only for the active filters, then let islice
+            # collect up to `limit` matches at C level.
+            preds = []
+            if event_type:
+                preds.append(lambda e: e.event_type == event_type)
+            if entity_id:
+                preds.append(lambda e: e.entity_id == entity_id)
+            if severity:
+                preds.append(lambda e: e.severity == severity)
 
-                if len(filtered_events) >= limit:
-                    break
+            if preds:
+                # Specialize for the common single-filter case so the hot
+                # loop runs one comparison per event, not all()/generator
+                # dispatch.
+                if len(preds) == 1:
+                    pred = preds[0]
+                else:
+                    def pred(e):
+                        et, eid, sev = _GET3(e)
+                        if event_type and et != event_type:
+                            return False
+                        if entity_id and eid != entity_id:
+                            return False
+                        return not severity or sev == severity
+                matches = (e for e in reversed(candidates) if pred(e))
+            else:
+                # Unfiltered queries for recent events can walk the small
+                # hot buffer instead of the full ring.
+                recent = siem_server.recent
+                if limit <= len(recent) or len(recent) == len(candidates):
+                    candidates = recent
+                matches = reversed(candidates)
 
-            return web.json_response({
+            # Large limits stream their encoding in chunks so the peak
+            # working set holds the event list but never the full JSON
+            # body at once. The matches are collected synchronously —
+            # no await between here and islice — so the deque iterators
+            # can't be invalidated by concurrent ingest.
+            if limit > _STREAM_THRESHOLD:
+                return await self._stream_events(
+                    request,
+                    list(islice(matches, limit)),
+                    len(siem_server.events),
+                )
+
+            filtered_events = [e.to_dict() for e in islice(matches, limit)]
+
+            body = orjson.dumps({
                 "events": filtered_events,
                 "count": len(filtered_events),
                 "total": len(siem_server.events)
             })
 
+            if len(self._response_cache) >= 32:
+                self._response_cache.pop(next(iter(self._response_cache)))
+            self._response_cache[cache_key] = body
+
+            return web.Response(body=body, content_type="application/json")
+
         except Exception as err:
             _LOGGER.error("Error in SIEM log viewer API: %s", err)
-            return web.json_response(
+            return _json_response(
                 {"error": str(err)},
-                status=500
+                status=500,
             )
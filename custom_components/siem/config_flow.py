@@ -20,6 +20,43 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# The user schema has static defaults, so build it once at import time
+# instead of on every form render.
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_MAX_EVENTS,
+            default=DEFAULT_MAX_EVENTS,
+        ): vol.Coerce(int),
+        vol.Optional(
+            CONF_RETENTION_DAYS,
+            default=DEFAULT_RETENTION_DAYS,
+        ): vol.Coerce(int),
+        vol.Optional(
+            CONF_ENABLE_SYSLOG,
+            default=True,
+        ): bool,
+        vol.Optional(
+            CONF_SYSLOG_PORT,
+            default=DEFAULT_SYSLOG_PORT,
+        ): vol.Coerce(int),
+        vol.Optional(
+            CONF_SYSLOG_HOST,
+            default=DEFAULT_SYSLOG_HOST,
+        ): str,
+    }
+)
+
+# (key, validator, fallback default) for the options form; the per-entry
+# defaults are filled in from options/data when the form is built.
+_OPTIONS_FIELDS = (
+    (CONF_MAX_EVENTS, vol.Coerce(int), DEFAULT_MAX_EVENTS),
+    (CONF_RETENTION_DAYS, vol.Coerce(int), DEFAULT_RETENTION_DAYS),
+    (CONF_ENABLE_SYSLOG, bool, True),
+    (CONF_SYSLOG_PORT, vol.Coerce(int), DEFAULT_SYSLOG_PORT),
+    (CONF_SYSLOG_HOST, str, DEFAULT_SYSLOG_HOST),
+)
+
 
 class SiemConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SIEM Server."""
@@ -56,34 +93,9 @@ class SiemConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         # Show configuration form
-        data_schema = vol.Schema(
-            {
-                vol.Optional(
-                    CONF_MAX_EVENTS,
-                    default=DEFAULT_MAX_EVENTS,
-                ): vol.Coerce(int),
-                vol.Optional(
-                    CONF_RETENTION_DAYS,
-                    default=DEFAULT_RETENTION_DAYS,
-                ): vol.Coerce(int),
-                vol.Optional(
-                    CONF_ENABLE_SYSLOG,
-                    default=True,
-                ): bool,
-                vol.Optional(
-                    CONF_SYSLOG_PORT,
-                    default=DEFAULT_SYSLOG_PORT,
-                ): vol.Coerce(int),
-                vol.Optional(
-                    CONF_SYSLOG_HOST,
-                    default=DEFAULT_SYSLOG_HOST,
-                ): str,
-            }
-        )
-
         return self.async_show_form(
             step_id="user",
-            data_schema=data_schema,
+            data_schema=_USER_SCHEMA,
             errors=errors,
         )
 
@@ -119,45 +131,15 @@ class SiemOptionsFlow(config_entries.OptionsFlow):
             if not errors:
                 return self.async_create_entry(title="", data=user_input)
 
+        options = self.options
+        data = self.data
         options_schema = vol.Schema(
             {
                 vol.Optional(
-                    CONF_MAX_EVENTS,
-                    default=self.options.get(
-                        CONF_MAX_EVENTS,
-                        self.data.get(CONF_MAX_EVENTS, DEFAULT_MAX_EVENTS),
-                    ),
-                ): vol.Coerce(int),
-                vol.Optional(
-                    CONF_RETENTION_DAYS,
-                    default=self.options.get(
-                        CONF_RETENTION_DAYS,
-                        self.data.get(
-                            CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS
-                        ),
-                    ),
-                ): vol.Coerce(int),
-                vol.Optional(
-                    CONF_ENABLE_SYSLOG,
-                    default=self.options.get(
-                        CONF_ENABLE_SYSLOG,
-                        self.data.get(CONF_ENABLE_SYSLOG, True),
-                    ),
-                ): bool,
-                vol.Optional(
-                    CONF_SYSLOG_PORT,
-                    default=self.options.get(
-                        CONF_SYSLOG_PORT,
-                        self.data.get(CONF_SYSLOG_PORT, DEFAULT_SYSLOG_PORT),
-                    ),
-                ): vol.Coerce(int),
-                vol.Optional(
-                    CONF_SYSLOG_HOST,
-                    default=self.options.get(
-                        CONF_SYSLOG_HOST,
-                        self.data.get(CONF_SYSLOG_HOST, DEFAULT_SYSLOG_HOST),
-                    ),
-                ): str,
+                    key,
+                    default=options.get(key, data.get(key, fallback)),
+                ): validator
+                for key, validator, fallback in _OPTIONS_FIELDS
             }
         )
 
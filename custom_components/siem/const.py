@@ -10,6 +10,11 @@ CONF_RETENTION_DAYS = "retention_days"
 CONF_ENABLE_SYSLOG = "enable_syslog"
 CONF_SYSLOG_PORT = "syslog_port"
 CONF_SYSLOG_HOST = "syslog_host"
+CONF_DASHBOARD_MODE = "dashboard_mode"
+
+# Dashboard modes
+DASHBOARD_MODE_STORAGE = "storage"
+DASHBOARD_MODE_NONE = "none"
 
 # Defaults
 DEFAULT_MAX_EVENTS = 50000
@@ -1,5 +1,13 @@
 """Lovelace dashboard configuration for SIEM."""
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+import orjson
+import yaml
+
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
 SIEM_DASHBOARD_CONFIG = {
     "views": [
@@ -179,6 +187,51 @@ SIEM_DASHBOARD_CONFIG = {
 }
 
 
+# Pre-serialized Lovelace storage payload. The dashboard config is static,
+# so the JSON bytes are produced once at import time instead of re-encoding
+# the dict on every config entry setup.
+_DASHBOARD_CONFIG_JSON = orjson.dumps(SIEM_DASHBOARD_CONFIG)
+
+SIEM_DASHBOARD_JSON = orjson.dumps(
+    {
+        "data": {"config": SIEM_DASHBOARD_CONFIG},
+        "key": "lovelace.siem_security",
+        "version": 1,
+    }
+)
+
+
 def get_dashboard_config() -> Dict[str, Any]:
-    """Get the SIEM dashboard configuration."""
-    return SIEM_DASHBOARD_CONFIG
+    """Get a fresh copy of the SIEM dashboard configuration.
+
+    Deserialized from the cached JSON bytes so callers can't mutate the
+    module-level dict and corrupt subsequent setups; an orjson round-trip
+    is far cheaper than copy.deepcopy on this tree.
+    """
+    return orjson.loads(_DASHBOARD_CONFIG_JSON)
+
+
+def get_dashboard_json_bytes() -> bytes:
+    """Get the pre-serialized Lovelace storage payload for the dashboard."""
+    return SIEM_DASHBOARD_JSON
+
+
+_dashboard_yaml: Optional[bytes] = None
+
+
+def get_dashboard_yaml_bytes() -> bytes:
+    """Get the dashboard config serialized as YAML.
+
+    Serialized once on first use with the libyaml C dumper when available
+    (falling back to the pure-Python SafeDumper) and cached module-wide,
+    since the config never changes at runtime.
+    """
+    global _dashboard_yaml
+    if _dashboard_yaml is None:
+        _dashboard_yaml = yaml.dump(
+            SIEM_DASHBOARD_CONFIG,
+            Dumper=_YamlDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+        ).encode("utf-8")
+    return _dashboard_yaml
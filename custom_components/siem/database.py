@@ -1,13 +1,122 @@
 """SQLite Database handler for SIEM events."""
 import logging
 import sqlite3
-import json
-from datetime import datetime, timedelta
+import msgpack
+import orjson
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 _LOGGER = logging.getLogger(__name__)
 
+# Constant SQL strings so sqlite3's statement cache can match by the
+# exact same string object and skip re-parsing on the hot paths.
+_INSERT_SQL = """
+    INSERT INTO events (
+        timestamp, ts_us, event_type_id, severity_id, message,
+        entity_id, user_id, data, device_type_id, source_ip, hostname
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Low-cardinality TEXT columns are normalized into these dictionary
+# tables; events stores INTEGER ids and the events_text view restores
+# the original column shape for queries.
+_DICT_TABLES = ('event_type', 'severity', 'device_type')
+
+# WHERE fragments for iter_events in bind order; each filter owns one
+# bit, so every combination of active filters maps to one bitmask and
+# therefore exactly one cached SQL string.
+_FILTER_CLAUSES = (
+    " AND event_type = ?",
+    " AND severity = ?",
+    " AND entity_id = ?",
+    " AND device_type = ?",
+    " AND source_ip = ?",
+    " AND message LIKE ?",
+    " AND ts_us >= ?",
+    " AND ts_us <= ?",
+)
+_KEYSET_BIT = 1 << len(_FILTER_CLAUSES)
+_KEYSET_CLAUSE = " AND (ts_us, id) < (?, ?)"
+
+
+def _iso_to_us(value) -> Optional[int]:
+    """Convert a timestamp to integer microseconds since the epoch.
+
+    Accepts ISO strings, datetimes, or already-converted ints; naive
+    timestamps are treated as UTC so comparisons stay consistent with
+    the values the insert path stores.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1_000_000)
+
+
+@lru_cache(maxsize=256)
+def _query_sql(fts: bool, mask: int) -> str:
+    """Build the iter_events SQL for one bitmask of active filters.
+
+    Caching returns the identical string object for repeated filter
+    combinations, so sqlite3's statement cache hits without re-parsing.
+    """
+    if fts:
+        sql = (
+            "SELECT events_text.* FROM events_text "
+            "JOIN events_fts ON events_fts.rowid = events_text.id "
+            "WHERE events_fts.message MATCH ?"
+        )
+    else:
+        sql = "SELECT * FROM events_text WHERE 1=1"
+    for i, clause in enumerate(_FILTER_CLAUSES):
+        if mask & (1 << i):
+            sql += clause
+    if mask & _KEYSET_BIT:
+        sql += _KEYSET_CLAUSE
+    return sql + " ORDER BY ts_us DESC, id DESC LIMIT ?"
+
+
+# All statistics breakdowns in one statement: each GROUP BY runs as an
+# index-only scan and the results come back in a single cursor.
+_STATS_SQL = """
+    SELECT 'tot' AS k, '' AS g, COUNT(*) AS n FROM events
+    UNION ALL
+    SELECT 'sev', name, n FROM (
+        SELECT severity_id AS did, COUNT(*) AS n FROM events GROUP BY severity_id
+    ) JOIN severity_dict ON severity_dict.id = did
+    UNION ALL
+    SELECT 'typ', name, n FROM (
+        SELECT event_type_id AS did, COUNT(*) AS n FROM events GROUP BY event_type_id
+    ) JOIN event_type_dict ON event_type_dict.id = did
+    UNION ALL
+    SELECT 'dev', name, n FROM (
+        SELECT device_type_id AS did, COUNT(*) AS n FROM events
+        WHERE device_type_id IS NOT NULL GROUP BY device_type_id
+    ) JOIN device_type_dict ON device_type_dict.id = did
+"""
+
+# Event data keys that have their own column and are stripped from the
+# JSON blob to avoid storing them twice.
+_DATA_COLUMN_KEYS = frozenset(('source_ip', 'hostname', 'device_type'))
+
+# Buffered single inserts flush once this many events are queued...
+_INSERT_BUFFER_SIZE = 500
+# ...or once the oldest queued event is this old (seconds).
+_INSERT_BUFFER_MAX_AGE = 1.0
+
 
 class SiemDatabase:
     """Manages SQLite database for SIEM events."""
@@ -20,10 +129,23 @@ class SiemDatabase:
         """
         self.db_path = db_path
         self.conn = None
+        self._insert_buffer: List[tuple] = []
+        self._insert_buffer_lock = threading.Lock()
+        self._insert_buffer_oldest = 0.0
+        # self.conn is the single writer, serialized by _write_lock;
+        # reads go through per-thread read-only connections so WAL can
+        # serve them concurrently with writes.
+        self._write_lock = threading.Lock()
+        # name -> id caches for the dictionary tables, one per kind
+        self._dict_cache = {kind: {} for kind in _DICT_TABLES}
+        self._reader_local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
         self._ensure_directory()
         self._connect()
         self._create_schema()
         self._create_indices()
+        self._init_stats_counters()
 
     def _ensure_directory(self):
         """Ensure database directory exists."""
@@ -35,62 +157,333 @@ class SiemDatabase:
             self.conn = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False,
-                timeout=30.0
+                cached_statements=256,
             )
             # Enable WAL mode for better concurrency
             self.conn.execute("PRAGMA journal_mode=WAL")
             self.conn.execute("PRAGMA synchronous=NORMAL")
+            # Read tuning: memory-map the database file (256 MB window),
+            # keep a 20 MB page cache so indices stay hot, and spill
+            # ORDER BY/temp b-trees to memory instead of temp files.
+            self.conn.execute("PRAGMA mmap_size=268435456")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-20000")
+            self.conn.execute("PRAGMA wal_autocheckpoint=1000")
+            # Native busy handler instead of the Python-level timeout.
+            self.conn.execute("PRAGMA busy_timeout=5000")
             self.conn.row_factory = sqlite3.Row
             _LOGGER.info("Connected to SIEM database: %s", self.db_path)
         except Exception as err:
             _LOGGER.error("Failed to connect to database: %s", err)
             raise
 
+    def _get_reader(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it lazily."""
+        conn = getattr(self._reader_local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.row_factory = sqlite3.Row
+        self._reader_local.conn = conn
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
+
     def _create_schema(self):
         """Create database schema if not exists."""
         try:
+            # Incremental auto-vacuum lets cleanup reclaim freed pages
+            # without the full-file rewrite (and exclusive lock) of
+            # VACUUM. Only takes effect on databases created after this
+            # pragma, so existing stores keep their current mode.
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            for kind in _DICT_TABLES:
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {kind}_dict (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL UNIQUE
+                    )
+                """)
+            # event_type/severity/device_type hold dictionary ids; the
+            # small integers shrink rows and index entries compared to
+            # repeating the same handful of strings on every row.
+            # ts_us mirrors timestamp as epoch microseconds: ordering and
+            # range scans compare 8-byte integers instead of ISO strings,
+            # while the TEXT column stays for display.
             self.conn.execute("""
                 CREATE TABLE IF NOT EXISTS events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp DATETIME NOT NULL,
-                    event_type TEXT NOT NULL,
-                    severity TEXT NOT NULL,
+                    ts_us INTEGER,
+                    event_type_id INTEGER NOT NULL
+                        REFERENCES event_type_dict(id),
+                    severity_id INTEGER NOT NULL
+                        REFERENCES severity_dict(id),
                     message TEXT NOT NULL,
                     entity_id TEXT,
                     user_id TEXT,
-                    data TEXT,
-                    device_type TEXT,
+                    data BLOB,
+                    device_type_id INTEGER
+                        REFERENCES device_type_dict(id),
                     source_ip TEXT,
                     hostname TEXT,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._migrate_text_columns()
+            self._migrate_ts_us()
+            # Back-compat view exposing the original text-column shape;
+            # SQLite flattens it, so filters still reach the indices.
+            self.conn.execute("DROP VIEW IF EXISTS events_text")
+            self.conn.execute("""
+                CREATE VIEW events_text AS
+                SELECT e.id, e.timestamp, e.ts_us,
+                       t.name AS event_type,
+                       s.name AS severity,
+                       e.message, e.entity_id, e.user_id, e.data,
+                       d.name AS device_type,
+                       e.source_ip, e.hostname, e.created_at
+                FROM events e
+                JOIN event_type_dict t ON t.id = e.event_type_id
+                JOIN severity_dict s ON s.id = e.severity_id
+                LEFT JOIN device_type_dict d ON d.id = e.device_type_id
+            """)
             self.conn.commit()
+            self._create_fts()
             _LOGGER.debug("Database schema created/verified")
         except Exception as err:
             _LOGGER.error("Failed to create schema: %s", err)
             raise
 
+    def _migrate_text_columns(self):
+        """Rebuild a legacy events table that still stores TEXT columns."""
+        columns = {
+            row[1] for row in self.conn.execute("PRAGMA table_info(events)")
+        }
+        if 'event_type' not in columns:
+            return
+
+        _LOGGER.info("Migrating events table to dictionary-id columns")
+        for kind in _DICT_TABLES:
+            self.conn.execute(f"""
+                INSERT OR IGNORE INTO {kind}_dict(name)
+                SELECT DISTINCT {kind} FROM events WHERE {kind} IS NOT NULL
+            """)
+        self.conn.execute("""
+            CREATE TABLE events_migrated (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME NOT NULL,
+                ts_us INTEGER,
+                event_type_id INTEGER NOT NULL
+                    REFERENCES event_type_dict(id),
+                severity_id INTEGER NOT NULL
+                    REFERENCES severity_dict(id),
+                message TEXT NOT NULL,
+                entity_id TEXT,
+                user_id TEXT,
+                data BLOB,
+                device_type_id INTEGER
+                    REFERENCES device_type_dict(id),
+                source_ip TEXT,
+                hostname TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.execute("""
+            INSERT INTO events_migrated
+            SELECT id, timestamp,
+                   CAST((julianday(timestamp) - 2440587.5)
+                        * 86400000000 AS INTEGER),
+                   (SELECT id FROM event_type_dict WHERE name = event_type),
+                   (SELECT id FROM severity_dict WHERE name = severity),
+                   message, entity_id, user_id, data,
+                   (SELECT id FROM device_type_dict WHERE name = device_type),
+                   source_ip, hostname, created_at
+            FROM events
+        """)
+        self.conn.execute("DROP TABLE events")
+        self.conn.execute("ALTER TABLE events_migrated RENAME TO events")
+        self.conn.commit()
+
+    def _migrate_ts_us(self):
+        """Add and backfill the epoch-microsecond timestamp column."""
+        columns = {
+            row[1] for row in self.conn.execute("PRAGMA table_info(events)")
+        }
+        if 'ts_us' not in columns:
+            self.conn.execute("ALTER TABLE events ADD COLUMN ts_us INTEGER")
+        self.conn.execute("""
+            UPDATE events
+            SET ts_us = CAST((julianday(timestamp) - 2440587.5)
+                             * 86400000000 AS INTEGER)
+            WHERE ts_us IS NULL
+        """)
+        self.conn.commit()
+
+    def _create_fts(self):
+        """Create the FTS5 index over events.message.
+
+        Message search via LIKE '%...%' forces a full table scan; the
+        external-content FTS table turns it into an inverted-index
+        lookup. Falls back to LIKE when this SQLite lacks FTS5.
+        """
+        try:
+            # Check before CREATE: only a freshly created table needs the
+            # rebuild below, and the check must happen while it is still
+            # absent.
+            fts_exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master"
+                " WHERE type = 'table' AND name = 'events_fts'"
+            ).fetchone() is not None
+            self.conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+                    message, content=events, content_rowid=id,
+                    tokenize="unicode61 remove_diacritics 2"
+                )
+            """)
+            self.conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS events_fts_ai
+                AFTER INSERT ON events BEGIN
+                    INSERT INTO events_fts(rowid, message)
+                    VALUES (new.id, new.message);
+                END
+            """)
+            self.conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS events_fts_ad
+                AFTER DELETE ON events BEGIN
+                    INSERT INTO events_fts(events_fts, rowid, message)
+                    VALUES ('delete', old.id, old.message);
+                END
+            """)
+            self.conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS events_fts_au
+                AFTER UPDATE OF message ON events BEGIN
+                    INSERT INTO events_fts(events_fts, rowid, message)
+                    VALUES ('delete', old.id, old.message);
+                    INSERT INTO events_fts(rowid, message)
+                    VALUES (new.id, new.message);
+                END
+            """)
+            # Index rows inserted before the FTS table existed. A plain
+            # rowid scan of an external-content table reads from the
+            # content table itself, so a NOT IN anti-join can never find
+            # unindexed rows; 'rebuild' repopulates the inverted index
+            # from events directly. Only needed right after creation —
+            # the triggers keep it current from then on.
+            if not fts_exists:
+                self.conn.execute(
+                    "INSERT INTO events_fts(events_fts) VALUES('rebuild')"
+                )
+            self.conn.commit()
+            self._fts_enabled = True
+        except Exception as err:
+            _LOGGER.warning("FTS5 unavailable, search falls back to LIKE: %s", err)
+            self._fts_enabled = False
+
     def _create_indices(self):
         """Create database indices for fast queries."""
         indices = [
-            "CREATE INDEX IF NOT EXISTS idx_timestamp ON events(timestamp DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_event_type ON events(event_type)",
-            "CREATE INDEX IF NOT EXISTS idx_severity ON events(severity)",
+            # Composite index matching query_events' ORDER BY timestamp
+            # DESC: the planner streams rows in order and applies the
+            # type/severity/device filters from the same index entries
+            # instead of building a temp sort b-tree. Subsumes the old
+            # single-column idx_timestamp.
+            "CREATE INDEX IF NOT EXISTS idx_tsus_type_sev "
+            "ON events(ts_us DESC, event_type_id, severity_id, device_type_id)",
+            "DROP INDEX IF EXISTS idx_ts_type_sev",
+            "DROP INDEX IF EXISTS idx_timestamp",
+            "CREATE INDEX IF NOT EXISTS idx_event_type ON events(event_type_id)",
+            "CREATE INDEX IF NOT EXISTS idx_severity ON events(severity_id)",
             "CREATE INDEX IF NOT EXISTS idx_entity_id ON events(entity_id)",
-            "CREATE INDEX IF NOT EXISTS idx_device_type ON events(device_type)",
-            "CREATE INDEX IF NOT EXISTS idx_source_ip ON events(source_ip)",
-            "CREATE INDEX IF NOT EXISTS idx_created_at ON events(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_device_type ON events(device_type_id)",
+            # created_at is never queried, and most events have no
+            # source_ip; the partial index keeps IP lookups while
+            # skipping the B-tree write for every NULL row.
+            "DROP INDEX IF EXISTS idx_created_at",
+            "DROP INDEX IF EXISTS idx_source_ip",
+            "CREATE INDEX IF NOT EXISTS idx_src_ip_notnull "
+            "ON events(source_ip) WHERE source_ip IS NOT NULL",
         ]
         
         try:
             for index_sql in indices:
                 self.conn.execute(index_sql)
+            # Refresh planner statistics so the composite index is picked
+            self.conn.execute("ANALYZE")
             self.conn.commit()
             _LOGGER.debug("Database indices created/verified")
         except Exception as err:
             _LOGGER.error("Failed to create indices: %s", err)
 
+    def _init_stats_counters(self):
+        """Maintain incremental statistics counters on the writer.
+
+        get_statistics would otherwise re-aggregate the whole table on
+        every poll. Counters live in a TEMP table (in-memory via
+        temp_store) kept current by TEMP triggers on events, so stats
+        become point lookups. TEMP rather than an attached ':memory:'
+        database because SQLite triggers on main tables may not touch
+        other databases, while temporary triggers may touch main.
+        """
+        try:
+            self.conn.execute("""
+                CREATE TEMP TABLE stats_counters (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    n INTEGER NOT NULL,
+                    PRIMARY KEY (kind, key)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("""
+                CREATE TEMP TRIGGER events_stats_ai
+                AFTER INSERT ON events BEGIN
+                    INSERT INTO stats_counters(kind, key, n) VALUES
+                        ('tot', '', 1),
+                        ('sev', (SELECT name FROM severity_dict
+                                 WHERE id = new.severity_id), 1),
+                        ('typ', (SELECT name FROM event_type_dict
+                                 WHERE id = new.event_type_id), 1),
+                        ('dev', COALESCE((SELECT name FROM device_type_dict
+                                          WHERE id = new.device_type_id), ''), 1)
+                    ON CONFLICT(kind, key) DO UPDATE SET n = n + 1;
+                END
+            """)
+            self.conn.execute("""
+                CREATE TEMP TRIGGER events_stats_ad
+                AFTER DELETE ON events BEGIN
+                    UPDATE stats_counters SET n = n - 1
+                    WHERE (kind = 'tot' AND key = '')
+                       OR (kind = 'sev' AND key = (SELECT name FROM severity_dict
+                                                   WHERE id = old.severity_id))
+                       OR (kind = 'typ' AND key = (SELECT name FROM event_type_dict
+                                                   WHERE id = old.event_type_id))
+                       OR (kind = 'dev' AND key = COALESCE(
+                               (SELECT name FROM device_type_dict
+                                WHERE id = old.device_type_id), ''));
+                END
+            """)
+            # Backfill once from the rows already on disk
+            self.conn.execute(
+                "INSERT INTO stats_counters(kind, key, n) " + _STATS_SQL
+            )
+            self.conn.commit()
+            self._counters_enabled = True
+        except Exception as err:
+            _LOGGER.warning(
+                "Stats counters unavailable, falling back to scans: %s", err
+            )
+            self._counters_enabled = False
+
     def insert_event(self, event: Dict[str, Any]) -> int:
         """Insert a single event into database.
         
@@ -101,65 +494,135 @@ class SiemDatabase:
             Event ID
         """
         try:
-            # Serialize data as JSON
-            data_json = json.dumps(event.get('data', {}))
-            
-            cursor = self.conn.execute("""
-                INSERT INTO events (
-                    timestamp, event_type, severity, message,
-                    entity_id, user_id, data, device_type, source_ip, hostname
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event.get('timestamp'),
-                event.get('event_type'),
-                event.get('severity'),
-                event.get('message'),
-                event.get('entity_id'),
-                event.get('user_id'),
-                data_json,
-                event.get('device_type'),
-                event.get('source_ip'),
-                event.get('hostname'),
-            ))
-            self.conn.commit()
-            return cursor.lastrowid
+            # Resolve dictionary ids before taking the write lock
+            row = self._event_row(event)
+            with self._write_lock:
+                cursor = self.conn.execute(_INSERT_SQL, row)
+                self.conn.commit()
+                return cursor.lastrowid
         except Exception as err:
             _LOGGER.error("Failed to insert event: %s", err)
             self.conn.rollback()
             raise
 
+    def queue_event(self, event: Dict[str, Any]) -> None:
+        """Queue a single event for a batched insert.
+
+        High-rate ingest paths should prefer this over insert_event: each
+        direct insert commits (and fsyncs) its own transaction, while
+        queued events are drained in one transaction once the buffer
+        reaches its size or age threshold.
+
+        Args:
+            event: Event dictionary
+        """
+        now = time.monotonic()
+        with self._insert_buffer_lock:
+            if not self._insert_buffer:
+                self._insert_buffer_oldest = now
+            self._insert_buffer.append(self._event_row(event))
+            should_flush = (
+                len(self._insert_buffer) >= _INSERT_BUFFER_SIZE
+                or now - self._insert_buffer_oldest >= _INSERT_BUFFER_MAX_AGE
+            )
+        if should_flush:
+            self.flush_queued_events()
+
+    def flush_queued_events(self) -> int:
+        """Drain the insert buffer in a single transaction.
+
+        Returns:
+            Number of flushed events
+        """
+        with self._insert_buffer_lock:
+            rows = self._insert_buffer
+            self._insert_buffer = []
+        if not rows:
+            return 0
+
+        try:
+            with self._write_lock:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.conn.executemany(_INSERT_SQL, rows)
+                self.conn.commit()
+            return len(rows)
+        except Exception as err:
+            _LOGGER.error("Failed to flush queued events: %s", err)
+            self.conn.rollback()
+            raise
+
+    def _dict_id(self, kind: str, name: Optional[str]) -> Optional[int]:
+        """Resolve a dictionary-table id for a name, inserting if new."""
+        if name is None:
+            return None
+        cache = self._dict_cache[kind]
+        dict_id = cache.get(name)
+        if dict_id is None:
+            with self._write_lock:
+                self.conn.execute(
+                    f"INSERT OR IGNORE INTO {kind}_dict(name) VALUES (?)",
+                    (name,),
+                )
+                dict_id = self.conn.execute(
+                    f"SELECT id FROM {kind}_dict WHERE name = ?", (name,)
+                ).fetchone()[0]
+                self.conn.commit()
+            cache[name] = dict_id
+        return dict_id
+
+    def _event_row(self, event: Dict[str, Any]) -> tuple:
+        """Build the parameter tuple for the events INSERT."""
+        # Keys that already have native columns are promoted out of the
+        # JSON blob instead of being stored twice.
+        data = event.get('data') or {}
+        if data:
+            slim = {
+                k: v for k, v in data.items()
+                if k not in _DATA_COLUMN_KEYS
+            }
+        else:
+            slim = data
+        timestamp = event.get('timestamp')
+        return (
+            timestamp,
+            _iso_to_us(timestamp) or _iso_to_us(datetime.now()),
+            self._dict_id('event_type', event.get('event_type') or 'unknown'),
+            self._dict_id('severity', event.get('severity') or 'low'),
+            event.get('message'),
+            event.get('entity_id'),
+            event.get('user_id'),
+            msgpack.packb(slim, use_bin_type=True),
+            self._dict_id(
+                'device_type',
+                event.get('device_type') or data.get('device_type'),
+            ),
+            event.get('source_ip') or data.get('source_ip'),
+            event.get('hostname') or data.get('hostname'),
+        )
+
     def insert_events_bulk(self, events: List[Dict[str, Any]]) -> int:
         """Insert multiple events efficiently.
-        
+
         Args:
             events: List of event dictionaries
-            
+
         Returns:
             Number of inserted events
         """
         try:
-            data = []
-            for event in events:
-                data.append((
-                    event.get('timestamp'),
-                    event.get('event_type'),
-                    event.get('severity'),
-                    event.get('message'),
-                    event.get('entity_id'),
-                    event.get('user_id'),
-                    json.dumps(event.get('data', {})),
-                    event.get('device_type'),
-                    event.get('source_ip'),
-                    event.get('hostname'),
-                ))
-            
-            self.conn.executemany("""
-                INSERT INTO events (
-                    timestamp, event_type, severity, message,
-                    entity_id, user_id, data, device_type, source_ip, hostname
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, data)
-            self.conn.commit()
+            data = [self._event_row(event) for event in events]
+
+            # One explicit transaction so the whole batch costs a single
+            # WAL flush; BEGIN IMMEDIATE takes the write lock up front
+            # instead of escalating mid-batch.
+            with self._write_lock:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.conn.executemany(_INSERT_SQL, data)
+                self.conn.commit()
+                # Large batches can outrun the autocheckpoint; drain the
+                # WAL now so readers never page through a huge log.
+                if len(events) >= 1000:
+                    self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             _LOGGER.info("Bulk inserted %d events", len(events))
             return len(events)
         except Exception as err:
@@ -167,10 +630,11 @@ class SiemDatabase:
             self.conn.rollback()
             raise
 
-    def query_events(
+    def iter_events(
         self,
         limit: int = 1000,
-        offset: int = 0,
+        after_timestamp: Optional[str] = None,
+        after_id: Optional[int] = None,
         event_type: Optional[str] = None,
         severity: Optional[str] = None,
         entity_id: Optional[str] = None,
@@ -179,12 +643,22 @@ class SiemDatabase:
         search: Optional[str] = None,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
-    ) -> List[Dict[str, Any]]:
-        """Query events with filters.
-        
+    ):
+        """Yield matching events one at a time.
+
+        SQLite streams rows from the cursor anyway; yielding as they
+        arrive avoids materializing the whole result before the caller
+        sees the first event, so large limits cost one row of memory.
+
+        Pagination is keyset-based: pass the timestamp and id of the last
+        row of the previous page to fetch the next one. Unlike OFFSET,
+        each page costs O(limit) regardless of how deep it is.
+
         Args:
             limit: Maximum number of events to return
-            offset: Offset for pagination
+            after_timestamp: Return events older than this cursor
+                timestamp (ISO string, datetime, or ts_us integer)
+            after_id: Cursor id tie-breaker for equal timestamps
             event_type: Filter by event type
             severity: Filter by severity
             entity_id: Filter by entity ID
@@ -193,64 +667,66 @@ class SiemDatabase:
             search: Search in message field
             start_time: Filter events after this time
             end_time: Filter events before this time
-            
+
+        Yields:
+            Event dictionaries
+        """
+        fts = bool(search and self._fts_enabled)
+        if fts:
+            # Prefix query against the FTS index instead of a LIKE scan
+            params = ['"%s"*' % search.replace('"', '""')]
+            search = None
+        else:
+            params = []
+
+        # Values aligned with _FILTER_CLAUSES bind order
+        mask = 0
+        for i, value in enumerate((
+            event_type,
+            severity,
+            entity_id,
+            device_type,
+            source_ip,
+            f"%{search}%" if search else None,
+            _iso_to_us(start_time),
+            _iso_to_us(end_time),
+        )):
+            if value:
+                mask |= 1 << i
+                params.append(value)
+
+        if after_timestamp is not None:
+            mask |= _KEYSET_BIT
+            params.extend([_iso_to_us(after_timestamp), after_id or 0])
+
+        sql = _query_sql(fts, mask)
+        params.append(limit)
+
+        for row in self._get_reader().execute(sql, params):
+            event = dict(row)
+            # Decode the data blob; rows written before the msgpack
+            # switch still hold JSON text and decode via orjson.
+            data = event.get('data')
+            if data:
+                try:
+                    if isinstance(data, bytes):
+                        event['data'] = msgpack.unpackb(data, raw=False)
+                    else:
+                        event['data'] = orjson.loads(data)
+                except Exception:
+                    pass
+            yield event
+
+    def query_events(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Query events with filters, materialized as a list.
+
+        Thin wrapper around iter_events; see there for the parameters.
+
         Returns:
             List of event dictionaries
         """
         try:
-            sql = "SELECT * FROM events WHERE 1=1"
-            params = []
-
-            if event_type:
-                sql += " AND event_type = ?"
-                params.append(event_type)
-            
-            if severity:
-                sql += " AND severity = ?"
-                params.append(severity)
-            
-            if entity_id:
-                sql += " AND entity_id = ?"
-                params.append(entity_id)
-            
-            if device_type:
-                sql += " AND device_type = ?"
-                params.append(device_type)
-            
-            if source_ip:
-                sql += " AND source_ip = ?"
-                params.append(source_ip)
-            
-            if search:
-                sql += " AND message LIKE ?"
-                params.append(f"%{search}%")
-            
-            if start_time:
-                sql += " AND timestamp >= ?"
-                params.append(start_time.isoformat())
-            
-            if end_time:
-                sql += " AND timestamp <= ?"
-                params.append(end_time.isoformat())
-
-            sql += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
-
-            cursor = self.conn.execute(sql, params)
-            rows = cursor.fetchall()
-
-            events = []
-            for row in rows:
-                event = dict(row)
-                # Parse JSON data field
-                if event.get('data'):
-                    try:
-                        event['data'] = json.loads(event['data'])
-                    except:
-                        pass
-                events.append(event)
-
-            return events
+            return list(self.iter_events(*args, **kwargs))
         except Exception as err:
             _LOGGER.error("Failed to query events: %s", err)
             return []
@@ -270,7 +746,7 @@ class SiemDatabase:
             Number of events
         """
         try:
-            sql = "SELECT COUNT(*) as count FROM events WHERE 1=1"
+            sql = "SELECT COUNT(*) as count FROM events_text WHERE 1=1"
             params = []
 
             if event_type:
@@ -281,7 +757,7 @@ class SiemDatabase:
                 sql += " AND severity = ?"
                 params.append(severity)
 
-            cursor = self.conn.execute(sql, params)
+            cursor = self._get_reader().execute(sql, params)
             result = cursor.fetchone()
             return result['count'] if result else 0
         except Exception as err:
@@ -301,38 +777,35 @@ class SiemDatabase:
                 'by_type': {},
                 'by_device': {},
             }
+            buckets = {
+                'sev': stats['by_severity'],
+                'typ': stats['by_type'],
+                'dev': stats['by_device'],
+            }
 
-            # Total events
-            cursor = self.conn.execute("SELECT COUNT(*) as count FROM events")
-            result = cursor.fetchone()
-            stats['total_events'] = result['count'] if result else 0
+            if self._counters_enabled:
+                # O(1) in table size: read the trigger-maintained counters
+                with self._write_lock:
+                    rows = self.conn.execute(
+                        "SELECT kind, key, n FROM stats_counters WHERE n > 0"
+                    ).fetchall()
+            else:
+                rows = self._get_reader().execute(_STATS_SQL)
 
-            # By severity
-            cursor = self.conn.execute("""
-                SELECT severity, COUNT(*) as count 
-                FROM events 
-                GROUP BY severity
-            """)
-            stats['by_severity'] = {row['severity']: row['count'] for row in cursor}
-
-            # By type
-            cursor = self.conn.execute("""
-                SELECT event_type, COUNT(*) as count 
-                FROM events 
-                GROUP BY event_type
-                ORDER BY count DESC
-                LIMIT 20
-            """)
-            stats['by_type'] = {row['event_type']: row['count'] for row in cursor}
-
-            # By device type
-            cursor = self.conn.execute("""
-                SELECT device_type, COUNT(*) as count 
-                FROM events 
-                WHERE device_type IS NOT NULL
-                GROUP BY device_type
-            """)
-            stats['by_device'] = {row['device_type']: row['count'] for row in cursor}
+            for kind, group, count in rows:
+                if kind == 'tot':
+                    stats['total_events'] = count
+                elif kind == 'dev' and group == '':
+                    continue
+                else:
+                    buckets[kind][group] = count
+
+            # Keep only the 20 most frequent event types
+            by_type = stats['by_type']
+            if len(by_type) > 20:
+                stats['by_type'] = dict(
+                    sorted(by_type.items(), key=lambda kv: kv[1], reverse=True)[:20]
+                )
 
             return stats
         except Exception as err:
@@ -350,18 +823,22 @@ class SiemDatabase:
         """
         try:
             cutoff_date = datetime.now() - timedelta(days=retention_days)
-            cursor = self.conn.execute(
-                "DELETE FROM events WHERE timestamp < ?",
-                (cutoff_date.isoformat(),)
-            )
-            self.conn.commit()
-            deleted = cursor.rowcount
-            
+            with self._write_lock:
+                cursor = self.conn.execute(
+                    "DELETE FROM events WHERE ts_us < ?",
+                    (_iso_to_us(cutoff_date),)
+                )
+                self.conn.commit()
+                deleted = cursor.rowcount
+
+                if deleted > 0:
+                    # Reclaim freed pages without blocking readers
+                    self.conn.execute("PRAGMA incremental_vacuum(1000)")
+                    self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
             if deleted > 0:
                 _LOGGER.info("Cleaned up %d events older than %d days", deleted, retention_days)
-                # Optimize database after cleanup
-                self.conn.execute("VACUUM")
-            
+
             return deleted
         except Exception as err:
             _LOGGER.error("Failed to cleanup old events: %s", err)
@@ -375,22 +852,60 @@ class SiemDatabase:
             Number of deleted events
         """
         try:
-            cursor = self.conn.execute("DELETE FROM events")
-            self.conn.commit()
-            deleted = cursor.rowcount
+            with self._write_lock:
+                cursor = self.conn.execute("DELETE FROM events")
+                self.conn.commit()
+                deleted = cursor.rowcount
+
+                # Reclaim freed pages without blocking readers
+                self.conn.execute("PRAGMA incremental_vacuum(1000)")
+
             _LOGGER.info("Cleared all events: %d deleted", deleted)
-            
-            # Optimize database
-            self.conn.execute("VACUUM")
-            
             return deleted
         except Exception as err:
             _LOGGER.error("Failed to clear events: %s", err)
             self.conn.rollback()
             return 0
 
+    def checkpoint(self) -> None:
+        """Checkpoint the WAL and truncate it back to zero bytes.
+
+        Sustained ingest with concurrent readers can starve automatic
+        checkpoints and let the -wal file grow without bound; this lets
+        maintenance automations drain it explicitly.
+        """
+        try:
+            with self._write_lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            _LOGGER.debug("WAL checkpoint completed")
+        except Exception as err:
+            _LOGGER.error("Failed to checkpoint WAL: %s", err)
+
+    def vacuum(self) -> None:
+        """Run a full VACUUM.
+
+        Rewrites the whole database file under an exclusive lock, so this
+        is opt-in maintenance for off-hours; routine cleanup relies on
+        incremental vacuum instead.
+        """
+        try:
+            with self._write_lock:
+                self.conn.execute("VACUUM")
+            _LOGGER.info("Database vacuumed")
+        except Exception as err:
+            _LOGGER.error("Failed to vacuum database: %s", err)
+
     def close(self):
-        """Close database connection."""
+        """Close database connections."""
         if self.conn:
+            try:
+                self.flush_queued_events()
+            except Exception:
+                pass
             self.conn.close()
-            _LOGGER.debug("Database connection closed")
+        with self._readers_lock:
+            readers = self._readers
+            self._readers = []
+        for reader in readers:
+            reader.close()
+        _LOGGER.debug("Database connections closed")
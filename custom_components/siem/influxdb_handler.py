@@ -1,12 +1,65 @@
 """InfluxDB handler for SIEM events."""
 import logging
+import re
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from influxdb import InfluxDBClient
-import json
+import orjson
 
 _LOGGER = logging.getLogger(__name__)
 
+# data keys already stored as their own tag or field; stripped from the
+# data_json blob instead of being written twice per point.
+_DATA_POINT_KEYS = frozenset(('source_ip', 'device_type'))
+
+
+def _data_json(data: Dict[str, Any]) -> str:
+    """Serialize the event data blob, minus keys stored as columns."""
+    if data:
+        data = {k: v for k, v in data.items() if k not in _DATA_POINT_KEYS}
+    return orjson.dumps(data or {}).decode()
+
+# Background flusher thresholds: drain the point buffer at least once
+# per interval, or immediately once this many points are pending.
+_FLUSH_INTERVAL = 1.0
+_FLUSH_BATCH_SIZE = 5000
+
+
+def _escape_tag(value: str) -> str:
+    """Escape a tag value per the InfluxDB line protocol."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(',', '\\,')
+        .replace(' ', '\\ ')
+        .replace('=', '\\=')
+    )
+
+
+def _escape_field(value: str) -> str:
+    """Escape a string field value per the InfluxDB line protocol."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _timestamp_ns(timestamp: Optional[str]) -> int:
+    """Convert an ISO timestamp to epoch nanoseconds."""
+    if timestamp:
+        try:
+            return int(datetime.fromisoformat(timestamp).timestamp() * 1e9)
+        except ValueError:
+            pass
+    return int(datetime.now().timestamp() * 1e9)
+
+# Compiled once at import; write_event runs this on every syslog event.
+# A single alternation scans raw_message once instead of once per field.
+_FIELDS_RE = re.compile(
+    r'user_name="(?P<user_name>[^"]+)"'
+    r'|src_ip=(?P<src_ip>\S+)'
+    r'|dst_ip=(?P<dst_ip>\S+)'
+    r'|protocol="(?P<protocol>[^"]+)"'
+)
+
 
 class SiemInfluxDB:
     """Manages InfluxDB connection and queries for SIEM events."""
@@ -34,10 +87,23 @@ class SiemInfluxDB:
         self.password = password
         self.database = database
         self.client: Optional[InfluxDBClient] = None
-        
+
+        # Points are buffered here and written by a background thread so
+        # a single event costs an append, not an HTTP round-trip. Plain
+        # deque appends/poplefts are individually thread-safe, so the
+        # producers and the flusher need no lock.
+        self._buffer: deque = deque()
+        self._flush_wakeup = threading.Event()
+        self._closing = False
+
         self._connect()
         self._ensure_database()
 
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="siem-influx-flush", daemon=True
+        )
+        self._flush_thread.start()
+
     def _connect(self):
         """Connect to InfluxDB."""
         try:
@@ -87,123 +153,159 @@ class SiemInfluxDB:
             _LOGGER.error("Failed to ensure database: %s", err)
 
     def write_event(self, event: Dict[str, Any]) -> bool:
-        """Write a single event to InfluxDB.
-        
+        """Queue a single event for writing to InfluxDB.
+
+        The raw event dict is appended to an in-process buffer; the
+        background thread builds the points and flushes them, so the
+        caller (usually the HA event loop) pays one append per event —
+        no regex scan, no dict build, no HTTP round-trip.
+
         Args:
             event: Event dictionary
-            
+
         Returns:
-            True if successful
+            True if the event was queued
         """
-        try:
-            # Extract data for fields
-            data = event.get('data', {})
-            
-            # Parse raw_message if exists
-            raw_message = data.get('raw_message', '')
-            
-            # Build point
-            point = {
-                'measurement': 'siem_events',
-                'time': event.get('timestamp', datetime.now().isoformat()),
-                'tags': {
-                    'event_type': event.get('event_type', 'unknown'),
-                    'severity': event.get('severity', 'low'),
-                    'device_type': data.get('device_type', 'unknown'),
-                },
-                'fields': {
-                    'message': event.get('message', ''),
-                    'entity_id': event.get('entity_id') or '',
-                    'user_id': event.get('user_id') or '',
-                    'source_ip': data.get('source_ip') or data.get('hostname') or '',
-                    'data_json': json.dumps(data),
-                }
+        self._buffer.append(event)
+        if len(self._buffer) >= _FLUSH_BATCH_SIZE:
+            self._flush_wakeup.set()
+        return True
+
+    @staticmethod
+    def _build_point(event: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an InfluxDB point dict from an event (flusher thread)."""
+        # Extract data for fields
+        data = event.get('data', {})
+
+        # Parse raw_message if exists
+        raw_message = data.get('raw_message', '')
+
+        # Build point
+        point = {
+            'measurement': 'siem_events',
+            'time': event.get('timestamp', datetime.now().isoformat()),
+            'tags': {
+                'event_type': event.get('event_type', 'unknown'),
+                'severity': event.get('severity', 'low'),
+                'device_type': data.get('device_type', 'unknown'),
+            },
+            'fields': {
+                'message': event.get('message', ''),
+                'entity_id': event.get('entity_id') or '',
+                'user_id': event.get('user_id') or '',
+                'source_ip': data.get('source_ip') or data.get('hostname') or '',
+                'data_json': _data_json(data),
             }
-            
-            # Add optional tags if they exist
-            if event.get('entity_id'):
-                point['tags']['entity_id'] = event['entity_id']
-            
-            if data.get('source_ip'):
-                point['tags']['source_ip'] = data['source_ip']
-            
-            # Parse additional fields from raw_message
-            if raw_message:
-                point['fields']['raw_message'] = raw_message[:1000]  # Limit size
-                
-                # Extract key fields
-                if 'user_name=' in raw_message:
-                    import re
-                    match = re.search(r'user_name="([^"]+)"', raw_message)
-                    if match:
-                        point['tags']['user_name'] = match.group(1)
-                
-                if 'src_ip=' in raw_message:
-                    import re
-                    match = re.search(r'src_ip=([^\s]+)', raw_message)
-                    if match:
-                        point['fields']['src_ip'] = match.group(1)
-                
-                if 'dst_ip=' in raw_message:
-                    import re
-                    match = re.search(r'dst_ip=([^\s]+)', raw_message)
-                    if match:
-                        point['fields']['dst_ip'] = match.group(1)
-                
-                if 'protocol=' in raw_message:
-                    import re
-                    match = re.search(r'protocol="([^"]+)"', raw_message)
-                    if match:
-                        point['tags']['protocol'] = match.group(1)
-            
-            self.client.write_points([point])
-            return True
-            
+        }
+
+        # Add optional tags if they exist
+        if event.get('entity_id'):
+            point['tags']['entity_id'] = event['entity_id']
+
+        if data.get('source_ip'):
+            point['tags']['source_ip'] = data['source_ip']
+
+        # Parse additional fields from raw_message
+        if raw_message:
+            point['fields']['raw_message'] = raw_message[:1000]  # Limit size
+
+            # Extract key fields in one pass; first hit per field wins
+            tags = point['tags']
+            fields = point['fields']
+            for match in _FIELDS_RE.finditer(raw_message):
+                name = match.lastgroup
+                if name == 'src_ip' or name == 'dst_ip':
+                    fields.setdefault(name, match.group(name))
+                else:
+                    tags.setdefault(name, match.group(name))
+
+        return point
+
+    def _flush_loop(self):
+        """Drain the point buffer periodically or when it fills up."""
+        while not self._closing:
+            self._flush_wakeup.wait(_FLUSH_INTERVAL)
+            self._flush_wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Build and write all buffered events to InfluxDB."""
+        buffer = self._buffer
+        if not buffer:
+            return
+        # Drain via popleft: an event appended mid-drain is either taken
+        # into this batch or left for the next one, never lost the way a
+        # copy-then-clear would lose it
+        batch = []
+        while buffer:
+            try:
+                batch.append(buffer.popleft())
+            except IndexError:
+                break
+
+        points = []
+        for event in batch:
+            try:
+                points.append(self._build_point(event))
+            except Exception as err:
+                _LOGGER.error("Failed to build InfluxDB point: %s", err)
+
+        try:
+            self.client.write_points(points, batch_size=_FLUSH_BATCH_SIZE)
+            _LOGGER.debug("Flushed %d points to InfluxDB", len(points))
         except Exception as err:
-            _LOGGER.error("Failed to write event to InfluxDB: %s", err)
-            return False
+            _LOGGER.error(
+                "Failed to flush %d points to InfluxDB: %s", len(points), err
+            )
 
     def write_events_bulk(self, events: List[Dict[str, Any]]) -> int:
         """Write multiple events efficiently.
-        
+
+        Points are serialized straight to line protocol here instead of
+        building per-point dicts for the client to re-serialize.
+
         Args:
             events: List of event dictionaries
-            
+
         Returns:
             Number of successfully written events
         """
         try:
-            points = []
+            lines = []
             for event in events:
                 data = event.get('data', {})
                 raw_message = data.get('raw_message', '')
-                
-                point = {
-                    'measurement': 'siem_events',
-                    'time': event.get('timestamp', datetime.now().isoformat()),
-                    'tags': {
-                        'event_type': event.get('event_type', 'unknown'),
-                        'severity': event.get('severity', 'low'),
-                        'device_type': data.get('device_type', 'unknown'),
-                    },
-                    'fields': {
-                        'message': event.get('message', ''),
-                        'entity_id': event.get('entity_id') or '',
-                        'user_id': event.get('user_id') or '',
-                        'source_ip': data.get('source_ip') or '',
-                        'data_json': json.dumps(data),
-                    }
-                }
-                
+
+                fields = (
+                    'message="%s",entity_id="%s",user_id="%s",'
+                    'source_ip="%s",data_json="%s"' % (
+                        _escape_field(event.get('message', '')),
+                        _escape_field(event.get('entity_id') or ''),
+                        _escape_field(event.get('user_id') or ''),
+                        _escape_field(data.get('source_ip') or ''),
+                        _escape_field(_data_json(data)),
+                    )
+                )
                 if raw_message:
-                    point['fields']['raw_message'] = raw_message[:1000]
-                
-                points.append(point)
-            
-            self.client.write_points(points)
-            _LOGGER.info("Bulk wrote %d events to InfluxDB", len(points))
-            return len(points)
-            
+                    fields += ',raw_message="%s"' % _escape_field(
+                        raw_message[:1000]
+                    )
+
+                lines.append(
+                    'siem_events,event_type=%s,severity=%s,device_type=%s'
+                    ' %s %d' % (
+                        _escape_tag(event.get('event_type', 'unknown')),
+                        _escape_tag(event.get('severity', 'low')),
+                        _escape_tag(data.get('device_type', 'unknown')),
+                        fields,
+                        _timestamp_ns(event.get('timestamp')),
+                    )
+                )
+
+            self.client.write_points(lines, protocol='line')
+            _LOGGER.info("Bulk wrote %d events to InfluxDB", len(lines))
+            return len(lines)
+
         except Exception as err:
             _LOGGER.error("Failed to bulk write events: %s", err)
             return 0
@@ -237,44 +339,42 @@ class SiemInfluxDB:
             List of event dictionaries
         """
         try:
-            # Build WHERE clause
+            # Build WHERE clause with bind parameters; interpolating the
+            # values directly would allow InfluxQL injection
             where_clauses = []
-            
-            if event_type:
-                where_clauses.append(f"event_type = '{event_type}'")
-            
-            if severity:
-                where_clauses.append(f"severity = '{severity}'")
-            
-            if device_type:
-                where_clauses.append(f"device_type = '{device_type}'")
-            
-            if entity_id:
-                where_clauses.append(f"entity_id = '{entity_id}'")
-            
-            if source_ip:
-                where_clauses.append(f"source_ip = '{source_ip}'")
-            
-            if user_name:
-                where_clauses.append(f"user_name = '{user_name}'")
-            
+            bind_params = {}
+
+            for name, value in (
+                ('event_type', event_type),
+                ('severity', severity),
+                ('device_type', device_type),
+                ('entity_id', entity_id),
+                ('source_ip', source_ip),
+                ('user_name', user_name),
+            ):
+                if value:
+                    where_clauses.append(f"{name} = ${name}")
+                    bind_params[name] = value
+
             if start_time:
-                where_clauses.append(f"time >= '{start_time.isoformat()}'")
-            
+                where_clauses.append("time >= $start_time")
+                bind_params['start_time'] = start_time.isoformat()
+
             if end_time:
-                where_clauses.append(f"time <= '{end_time.isoformat()}'")
-            
+                where_clauses.append("time <= $end_time")
+                bind_params['end_time'] = end_time.isoformat()
+
             # Build query
-            query = f"SELECT * FROM siem_events"
-            
+            query = "SELECT * FROM siem_events"
+
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
-            
-            query += f" ORDER BY time DESC LIMIT {limit}"
-            
+
+            query += f" ORDER BY time DESC LIMIT {int(limit)}"
+
             _LOGGER.debug("InfluxDB query: %s", query)
-            
-            result = self.client.query(query)
+
+            result = self.client.query(query, bind_params=bind_params)
             
             # Convert to list of dicts
             events = []
@@ -283,7 +383,7 @@ class SiemInfluxDB:
                 data = {}
                 if point.get('data_json'):
                     try:
-                        data = json.loads(point['data_json'])
+                        data = orjson.loads(point['data_json'])
                     except:
                         pass
                 
@@ -320,19 +420,22 @@ class SiemInfluxDB:
         """
         try:
             where_clauses = []
-            
+            bind_params = {}
+
             if event_type:
-                where_clauses.append(f"event_type = '{event_type}'")
-            
+                where_clauses.append("event_type = $event_type")
+                bind_params['event_type'] = event_type
+
             if severity:
-                where_clauses.append(f"severity = '{severity}'")
-            
+                where_clauses.append("severity = $severity")
+                bind_params['severity'] = severity
+
             query = "SELECT COUNT(message) FROM siem_events"
-            
+
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
-            
-            result = self.client.query(query)
+
+            result = self.client.query(query, bind_params=bind_params)
             points = list(result.get_points())
             
             if points and 'count' in points[0]:
@@ -434,7 +537,11 @@ class SiemInfluxDB:
             return False
 
     def close(self):
-        """Close InfluxDB connection."""
+        """Flush pending points and close the InfluxDB connection."""
+        self._closing = True
+        self._flush_wakeup.set()
+        self._flush_thread.join(timeout=5)
+        self.flush()
         if self.client:
             self.client.close()
             _LOGGER.debug("InfluxDB connection closed")
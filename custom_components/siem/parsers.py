@@ -1,9 +1,26 @@
 """Log parsers for external devices (Sophos XGS, UniFi)."""
 import logging
 import re
-from datetime import datetime
+import sys
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
+# google-re2 compiles to a DFA and matches in linear time regardless of
+# how often the .*? segments below would make the stdlib backtracker
+# rescan. Optional: the stdlib engine is the drop-in fallback.
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+# pyahocorasick finds every anchor substring in one pass over the
+# message instead of one str.find per anchor. Optional, like re2: the
+# plain find loop is the fallback.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from .const import (
     EVENT_TYPE_FIREWALL_BLOCK,
     EVENT_TYPE_FIREWALL_ALLOW,
@@ -20,6 +37,56 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Cached %-templates for the hot message builders: formatting a tuple
+# through one template is a single C-level call, where the equivalent
+# f-string interpolates and concatenates piece by piece.
+_SOPHOS_FW_MSG = "Sophos Firewall %s: %s → %s"
+_SOPHOS_IPS_MSG = "%s: %s from %s"
+_SOPHOS_AUTH_MSG = "Sophos Auth: %s - %s"
+_SOPHOS_VPN_MSG = "Sophos VPN: %s from %s - %s"
+_UNIFI_WIFI_MSG = "UniFi WiFi: Client %s %s to %s"
+_UNIFI_AUTH_MSG = "UniFi Auth: %s - %s"
+_UNIFI_IPS_MSG = "UniFi IPS Alert: %s from %s"
+_UNIFI_GUEST_MSG = "UniFi Guest: %s authorized on guest portal"
+
+
+def _tokenize_kv(message: str) -> Dict[str, str]:
+    """Tokenize a key=value / key="value" structured message in one pass.
+
+    Sophos XGS logs are fully structured, so one linear scan extracts
+    every field at once instead of backtracking regexes re-walking the
+    line per pattern.
+    """
+    tokens = {}
+    find = message.find
+    length = len(message)
+    pos = 0
+    while True:
+        eq = find('=', pos)
+        if eq == -1:
+            break
+        # Key runs backwards from '=' over [A-Za-z0-9_]
+        start = eq - 1
+        while start >= 0 and (message[start].isalnum() or message[start] == '_'):
+            start -= 1
+        key = message[start + 1:eq]
+        vstart = eq + 1
+        if vstart < length and message[vstart] == '"':
+            vend = find('"', vstart + 1)
+            if vend == -1:
+                break
+            value = message[vstart + 1:vend]
+            pos = vend + 1
+        else:
+            vend = find(' ', vstart)
+            if vend == -1:
+                vend = length
+            value = message[vstart:vend]
+            pos = vend + 1
+        if key:
+            tokens[key] = value
+    return tokens
+
 
 class SophosXGSParser:
     """Parser for Sophos XGS Firewall logs."""
@@ -27,7 +94,7 @@ class SophosXGSParser:
     # Sophos XGS log patterns
     PATTERNS = {
         # Firewall deny/allow
-        'firewall': re.compile(
+        'firewall': re_engine.compile(
             r'log_subtype="(?P<action>Denied|Allowed)".*?'
             r'src_ip=(?P<src_ip>[\d.]+).*?'
             r'dst_ip=(?P<dst_ip>[\d.]+).*?'
@@ -36,20 +103,20 @@ class SophosXGSParser:
             r'(?:protocol="(?P<protocol>\w+)")?'
         ),
         # IPS events
-        'ips': re.compile(
+        'ips': re_engine.compile(
             r'log_subtype="(?P<subtype>IPS|ATP|DPI)".*?'
             r'src_ip=(?P<src_ip>[\d.]+).*?'
             r'(?:threat_name="(?P<threat>[^"]+)")?.*?'
             r'(?:signature_msg="(?P<signature>[^"]+)")?'
         ),
         # Authentication
-        'auth': re.compile(
+        'auth': re_engine.compile(
             r'log_subtype="(?P<subtype>Authentication|Admin)".*?'
             r'(?:user_name="(?P<user>[^"]+)")?.*?'
             r'(?:status="(?P<status>[^"]+)")?'
         ),
         # VPN
-        'vpn': re.compile(
+        'vpn': re_engine.compile(
             r'log_subtype="(?P<subtype>SSL-VPN|IPsec)".*?'
             r'(?:user="(?P<user>[^"]+)")?.*?'
             r'(?:remote_ip=(?P<remote_ip>[\d.]+))?.*?'
@@ -57,28 +124,133 @@ class SophosXGSParser:
         ),
     }
 
+    # log_subtype value -> log type for the tokenizer fast path
+    KV_DISPATCH = {
+        'Denied': 'firewall', 'Allowed': 'firewall',
+        'IPS': 'ips', 'ATP': 'ips', 'DPI': 'ips',
+        'Authentication': 'auth', 'Admin': 'auth',
+        'SSL-VPN': 'vpn', 'IPsec': 'vpn',
+    }
+
+    # (pattern group name, token key) pairs per log type, plus the token
+    # keys a message must carry for the fast path to trust its result
+    KV_FIELDS = {
+        'firewall': (('action', 'log_subtype'), ('src_ip', 'src_ip'),
+                     ('dst_ip', 'dst_ip'), ('src_port', 'src_port'),
+                     ('dst_port', 'dst_port'), ('protocol', 'protocol')),
+        'ips': (('subtype', 'log_subtype'), ('src_ip', 'src_ip'),
+                ('threat', 'threat_name'), ('signature', 'signature_msg')),
+        'auth': (('subtype', 'log_subtype'), ('user', 'user_name'),
+                 ('status', 'status')),
+        'vpn': (('subtype', 'log_subtype'), ('user', 'user'),
+                ('remote_ip', 'remote_ip'), ('status', 'status')),
+    }
+    KV_REQUIRED = {
+        'firewall': ('src_ip', 'dst_ip'),
+        'ips': ('src_ip',),
+        'auth': (),
+        'vpn': (),
+    }
+
+    # Constant parts of each event dict, interned once at class
+    # definition; handlers .copy() a template and fill in the per-event
+    # fields, which is one C-level memcpy instead of a dict literal
+    # re-inserting the same constant keys per message.
+    _FW_DENIED = {
+        "event_type": sys.intern(EVENT_TYPE_FIREWALL_BLOCK),
+        "severity": sys.intern(SEVERITY_MEDIUM),
+        "device_type": sys.intern("sophos_xgs"),
+    }
+    _FW_ALLOWED = {
+        "event_type": sys.intern(EVENT_TYPE_FIREWALL_ALLOW),
+        "severity": sys.intern(SEVERITY_LOW),
+        "device_type": "sophos_xgs",
+    }
+    _IPS_TEMPLATE = {
+        "event_type": sys.intern(EVENT_TYPE_IPS_ALERT),
+        "severity": sys.intern(SEVERITY_HIGH),
+        "device_type": "sophos_xgs",
+    }
+    _ATP_TEMPLATE = {
+        "event_type": sys.intern(EVENT_TYPE_ATP_ALERT),
+        "severity": SEVERITY_HIGH,
+        "device_type": "sophos_xgs",
+    }
+    _AUTH_TEMPLATE = {
+        "event_type": sys.intern(EVENT_TYPE_NETWORK_AUTH),
+        "device_type": "sophos_xgs",
+    }
+    _VPN_TEMPLATE = {
+        "event_type": sys.intern(EVENT_TYPE_VPN_CONNECTION),
+        "severity": SEVERITY_MEDIUM,
+        "device_type": "sophos_xgs",
+    }
+
+    # Anchor substrings implied by each pattern: a C-level `in` check is
+    # far cheaper than re.search, so patterns whose anchor is absent are
+    # skipped without touching the regex engine.
+    PREFILTERS = (
+        (('log_subtype="Denied', 'log_subtype="Allowed'), 'firewall'),
+        (('log_subtype="IPS', 'log_subtype="ATP', 'log_subtype="DPI'), 'ips'),
+        (('log_subtype="Authentication', 'log_subtype="Admin'), 'auth'),
+        (('log_subtype="SSL-VPN', 'log_subtype="IPsec'), 'vpn'),
+    )
+
     @staticmethod
     def parse(syslog_data: dict) -> Optional[dict]:
         """Parse Sophos XGS syslog message.
-        
+
         Args:
             syslog_data: Raw syslog data dictionary
-            
+
         Returns:
             Parsed event dictionary or None
         """
         message = syslog_data.get("message", "")
         hostname = syslog_data.get("hostname", "sophos")
         source_ip = syslog_data.get("source_ip")
-        
-        # Try to identify log type and parse
-        for log_type, pattern in SophosXGSParser.PATTERNS.items():
-            match = pattern.search(message)
-            if match:
-                return SophosXGSParser._parse_by_type(
-                    log_type, match, message, hostname, source_ip
+
+        # Every Sophos pattern requires a log_subtype token, so its
+        # absence skips all parsing work
+        if 'log_subtype="' in message:
+            # Bind the class lookups once for the hot path below
+            cls = SophosXGSParser
+            find = message.find
+
+            # Fast path: tokenize the structured message once and
+            # dispatch on log_subtype instead of running regexes
+            tokens = _tokenize_kv(message)
+            log_type = cls.KV_DISPATCH.get(tokens.get('log_subtype'))
+            if log_type and all(
+                key in tokens for key in cls.KV_REQUIRED[log_type]
+            ):
+                tokens_get = tokens.get
+                data = {
+                    name: tokens_get(key)
+                    for name, key in cls.KV_FIELDS[log_type]
+                }
+                return cls._parse_by_type(
+                    log_type, data, message, hostname, source_ip
                 )
-        
+
+            # Fallback: unusual field layouts still go through the regexes
+            for anchors, log_type in cls.PREFILTERS:
+                for anchor in anchors:
+                    idx = find(anchor)
+                    if idx != -1:
+                        break
+                else:
+                    continue
+                # Every pattern starts with its anchor literal, so the
+                # scan can begin where the prefilter already found it
+                # instead of re-walking the syslog header.
+                match = cls.PATTERNS[log_type].search(message, idx)
+                if match:
+                    return cls._parse_by_type(
+                        log_type, match.groupdict(), message,
+                        hostname, source_ip
+                    )
+
         # Return generic event if no specific pattern matches
         if "sophos" in hostname.lower() or "xgs" in message.lower():
             return {
@@ -94,139 +266,247 @@ class SophosXGSParser:
         return None
 
     @staticmethod
-    def _parse_by_type(log_type: str, match: re.Match, message: str, 
+    def _parse_firewall(data: Dict[str, Any], message: str,
+                        hostname: str, source_ip: str) -> dict:
+        """Build a firewall allow/deny event."""
+        # Bind each field once; repeated data.get calls hash the same
+        # key again for every lookup
+        action = data.get('action', 'Unknown')
+        dst_port = data.get('dst_port')
+
+        msg = _SOPHOS_FW_MSG % (
+            action, data.get('src_ip', 'unknown'), data.get('dst_ip', 'unknown')
+        )
+        if dst_port:
+            msg += f":{dst_port}"
+
+        out = (
+            SophosXGSParser._FW_DENIED if action == 'Denied'
+            else SophosXGSParser._FW_ALLOWED
+        ).copy()
+        out["message"] = msg
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["data"] = data
+        return out
+
+    @staticmethod
+    def _parse_ips(data: Dict[str, Any], message: str,
+                   hostname: str, source_ip: str) -> dict:
+        """Build an IPS/ATP/DPI alert event."""
+        threat = data.get('threat') or data.get('signature') or 'Unknown threat'
+        subtype = data.get('subtype', 'IPS')
+
+        # Unterscheide zwischen IPS und ATP
+        if subtype == 'ATP':
+            out = SophosXGSParser._ATP_TEMPLATE.copy()
+            msg_prefix = "Sophos ATP Alert"
+        else:
+            out = SophosXGSParser._IPS_TEMPLATE.copy()
+            msg_prefix = f"Sophos {subtype} Alert"
+
+        out["message"] = _SOPHOS_IPS_MSG % (
+            msg_prefix, threat, data.get('src_ip', 'unknown')
+        )
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["data"] = data
+        return out
+
+    @staticmethod
+    def _parse_auth(data: Dict[str, Any], message: str,
+                    hostname: str, source_ip: str) -> dict:
+        """Build an authentication/admin event."""
+        # The tokenizer fast path stores None for absent fields, so the
+        # fallback must cover both a missing key and a None value
+        user = data.get('user') or 'unknown'
+        status = data.get('status') or 'unknown'
+        out = SophosXGSParser._AUTH_TEMPLATE.copy()
+        out["severity"] = SEVERITY_HIGH if 'fail' in status.lower() else SEVERITY_LOW
+        out["message"] = _SOPHOS_AUTH_MSG % (user, status)
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["user_id"] = user
+        out["data"] = data
+        return out
+
+    @staticmethod
+    def _parse_vpn(data: Dict[str, Any], message: str,
+                   hostname: str, source_ip: str) -> dict:
+        """Build a VPN connection event."""
+        # or-defaults: the tokenizer stores None for absent fields
+        user = data.get('user') or 'unknown'
+        status = data.get('status') or 'unknown'
+        remote_ip = data.get('remote_ip') or 'unknown'
+
+        out = SophosXGSParser._VPN_TEMPLATE.copy()
+        out["message"] = _SOPHOS_VPN_MSG % (user, remote_ip, status)
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["user_id"] = user
+        out["data"] = data
+        return out
+
+    # log type -> specialized handler; O(1) dispatch replaces the old
+    # if/elif chain and keeps each branch independently optimizable
+    _HANDLERS = {
+        'firewall': _parse_firewall,
+        'ips': _parse_ips,
+        'auth': _parse_auth,
+        'vpn': _parse_vpn,
+    }
+
+    @staticmethod
+    def _parse_by_type(log_type: str, data: Dict[str, Any], message: str,
                        hostname: str, source_ip: str) -> dict:
         """Parse based on identified log type."""
-        data = match.groupdict()
-        
-        if log_type == 'firewall':
-            action = data.get('action', 'Unknown')
-            event_type = EVENT_TYPE_FIREWALL_BLOCK if action == 'Denied' else EVENT_TYPE_FIREWALL_ALLOW
-            severity = SEVERITY_MEDIUM if action == 'Denied' else SEVERITY_LOW
-            
-            msg = f"Sophos Firewall {action}: {data.get('src_ip', 'unknown')} → {data.get('dst_ip', 'unknown')}"
-            if data.get('dst_port'):
-                msg += f":{data['dst_port']}"
-            
-            return {
-                "event_type": event_type,
-                "severity": severity,
-                "message": msg,
-                "device_type": "sophos_xgs",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "data": data,
-            }
-        
-        elif log_type == 'ips':
-            threat = data.get('threat') or data.get('signature', 'Unknown threat')
-            subtype = data.get('subtype', 'IPS')
-            
-            # Unterscheide zwischen IPS und ATP
-            if subtype == 'ATP':
-                event_type = EVENT_TYPE_ATP_ALERT
-                msg_prefix = "Sophos ATP Alert"
-            else:
-                event_type = EVENT_TYPE_IPS_ALERT
-                msg_prefix = f"Sophos {subtype} Alert"
-            
-            return {
-                "event_type": event_type,
-                "severity": SEVERITY_HIGH,
-                "message": f"{msg_prefix}: {threat} from {data.get('src_ip', 'unknown')}",
-                "device_type": "sophos_xgs",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "data": data,
-            }
-        
-        elif log_type == 'auth':
-            user = data.get('user', 'unknown')
-            status = data.get('status', 'unknown')
-            severity = SEVERITY_HIGH if 'fail' in status.lower() else SEVERITY_LOW
-            
-            return {
-                "event_type": EVENT_TYPE_NETWORK_AUTH,
-                "severity": severity,
-                "message": f"Sophos Auth: {user} - {status}",
-                "device_type": "sophos_xgs",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "user_id": user,
-                "data": data,
-            }
-        
-        elif log_type == 'vpn':
-            user = data.get('user', 'unknown')
-            status = data.get('status', 'unknown')
-            remote_ip = data.get('remote_ip', 'unknown')
-            
-            return {
-                "event_type": EVENT_TYPE_VPN_CONNECTION,
-                "severity": SEVERITY_MEDIUM,
-                "message": f"Sophos VPN: {user} from {remote_ip} - {status}",
-                "device_type": "sophos_xgs",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "user_id": user,
-                "data": data,
-            }
-        
-        return None
+        handler = SophosXGSParser._HANDLERS.get(log_type)
+        if handler is None:
+            return None
+        return handler(data, message, hostname, source_ip)
 
 
 class UniFiParser:
     """Parser for UniFi device logs."""
 
-    # UniFi log patterns
-    PATTERNS = {
-        # WiFi client events
-        'wifi_client': re.compile(
-            r'(?:sta_(?:connect|disconnect)|client_(?:connected|disconnected))'
-            r'.*?(?:mac|client)[=:]?\s*(?P<mac>[\da-f:]{17})'
-            r'.*?(?:(?:ap|device)[=:]?\s*(?P<ap>[\w-]+))?'
-        , re.IGNORECASE),
-        # Authentication
-        'auth': re.compile(
-            r'(?:auth|authentication).*?'
-            r'(?:user[=:]?\s*(?P<user>[\w@.-]+))?.*?'
-            r'(?:(?:failed|success|deny|allow))'
-        , re.IGNORECASE),
-        # IPS/IDS
-        'ips': re.compile(
-            r'(?:IDS|IPS).*?'
-            r'(?:signature[=:]?\s*(?P<signature>[^,\]]+))?.*?'
-            r'(?:src[=:]?\s*(?P<src_ip>[\d.]+))?'
-        , re.IGNORECASE),
-        # Guest portal
-        'guest': re.compile(
-            r'guest.*?(?:authorize|portal)'
-            r'.*?(?:mac[=:]?\s*(?P<mac>[\da-f:]{17}))?'
-        , re.IGNORECASE),
+    # All four UniFi patterns folded into one alternation so a message is
+    # scanned once instead of once per pattern; the outer named group
+    # identifies the log type and the prefixed inner groups avoid name
+    # collisions between alternatives.
+    COMBINED = re_engine.compile(
+        r'(?P<wifi_client>(?:sta_(?:connect|disconnect)|client_(?:connected|disconnected))'
+        r'.*?(?:mac|client)[=:]?\s*(?P<wc_mac>[\da-f:]{17})'
+        r'.*?(?:(?:ap|device)[=:]?\s*(?P<wc_ap>[\w-]+))?)'
+        r'|(?P<auth>(?:auth|authentication).*?'
+        r'(?:user[=:]?\s*(?P<au_user>[\w@.-]+))?.*?'
+        r'(?:(?:failed|success|deny|allow)))'
+        r'|(?P<ips>(?:IDS|IPS).*?'
+        r'(?:signature[=:]?\s*(?P<ip_signature>[^,\]]+))?.*?'
+        r'(?:src[=:]?\s*(?P<ip_src_ip>[\d.]+))?)'
+        r'|(?P<guest>guest.*?(?:authorize|portal)'
+        r'.*?(?:mac[=:]?\s*(?P<gu_mac>[\da-f:]{17}))?)'
+    , re_engine.IGNORECASE)
+
+    # log type -> (field name, combined group name) pairs
+    COMBINED_GROUPS = {
+        'wifi_client': (('mac', 'wc_mac'), ('ap', 'wc_ap')),
+        'auth': (('user', 'au_user'),),
+        'ips': (('signature', 'ip_signature'), ('src_ip', 'ip_src_ip')),
+        'guest': (('mac', 'gu_mac'),),
     }
 
+    # Lowercased anchor substrings implied by the (case-insensitive)
+    # alternatives, checked against one lowered copy of the message
+    # before the combined regex runs.
+    PREFILTERS = (
+        'sta_connect', 'sta_disconnect',
+        'client_connected', 'client_disconnected',
+        'auth', 'ids', 'ips', 'guest',
+    )
+
+    # Constant event-dict parts, mirroring the Sophos templates; guest
+    # events share the WiFi template (same type/severity).
+    _WIFI_TEMPLATE = {
+        "event_type": sys.intern(EVENT_TYPE_WIFI_CLIENT),
+        "severity": sys.intern(SEVERITY_LOW),
+        "device_type": sys.intern("unifi"),
+    }
+    _AUTH_TEMPLATE = {
+        "event_type": EVENT_TYPE_NETWORK_AUTH,
+        "device_type": "unifi",
+    }
+    _IPS_TEMPLATE = {
+        "event_type": EVENT_TYPE_IPS_ALERT,
+        "severity": SEVERITY_HIGH,
+        "device_type": "unifi",
+    }
+
+    _HEX_DIGITS = frozenset('0123456789abcdef')
+
+    @staticmethod
+    def _find_mac(message: str, msg_lower: str) -> Optional[str]:
+        """Locate an aa:bb:cc:dd:ee:ff token without the regex engine.
+
+        A MAC is fixed-width, so scanning for ':' and validating the 17
+        characters around it beats a regex search. The slice is taken
+        from the original message to preserve its case.
+        """
+        hex_digits = UniFiParser._HEX_DIGITS
+        find = msg_lower.find
+        pos = find(':', 2)
+        while pos != -1:
+            start = pos - 2
+            candidate = msg_lower[start:start + 17]
+            if len(candidate) == 17 and candidate.count(':') == 5:
+                for i, ch in enumerate(candidate):
+                    if (ch == ':') != (i % 3 == 2):
+                        break
+                    if ch != ':' and ch not in hex_digits:
+                        break
+                else:
+                    return message[start:start + 17]
+            pos = find(':', pos + 1)
+        return None
+
     @staticmethod
     def parse(syslog_data: dict) -> Optional[dict]:
         """Parse UniFi syslog message.
-        
+
         Args:
             syslog_data: Raw syslog data dictionary
-            
+
         Returns:
             Parsed event dictionary or None
         """
         message = syslog_data.get("message", "")
         hostname = syslog_data.get("hostname", "unifi")
         source_ip = syslog_data.get("source_ip")
-        
-        # Try to identify log type and parse
-        for log_type, pattern in UniFiParser.PATTERNS.items():
-            match = pattern.search(message)
-            if match:
-                return UniFiParser._parse_by_type(
-                    log_type, match, message, hostname, source_ip
+
+        msg_lower = message.lower()
+
+        # Fast path: WiFi client connect/disconnect is by far the most
+        # common UniFi event and needs no regex at all — the keyword
+        # tests pick the type and the MAC is a fixed-width token.
+        cls = UniFiParser
+        if (
+            'sta_connect' in msg_lower
+            or 'sta_disconnect' in msg_lower
+            or 'client_connected' in msg_lower
+            or 'client_disconnected' in msg_lower
+        ):
+            mac = cls._find_mac(message, msg_lower)
+            if mac is not None:
+                return cls._parse_wifi_client(
+                    {'mac': mac, 'ap': None}, message, hostname, source_ip
                 )
-        
+
+        # Try to identify log type and parse. Every alternative in the
+        # combined pattern begins at one of the anchor substrings, so the
+        # scan starts at the earliest anchor hit rather than position 0.
+        first = -1
+        if _UNIFI_ANCHORS is not None:
+            # One Aho-Corasick pass over the message covers all anchors
+            for end, anchor in _UNIFI_ANCHORS.iter(msg_lower):
+                start = end - len(anchor) + 1
+                if first == -1 or start < first:
+                    first = start
+        else:
+            find = msg_lower.find
+            for anchor in cls.PREFILTERS:
+                idx = find(anchor)
+                if idx != -1 and (first == -1 or idx < first):
+                    first = idx
+        if first != -1:
+            match = cls.COMBINED.search(message, first)
+            if match:
+                group = match.group
+                for log_type, fields in cls.COMBINED_GROUPS.items():
+                    if group(log_type) is not None:
+                        data = {name: group(g) for name, g in fields}
+                        return cls._parse_by_type(
+                            log_type, data, message, hostname, source_ip
+                        )
+
         # Return generic event if no specific pattern matches
         if "unifi" in hostname.lower() or "ubnt" in message.lower():
             return {
@@ -242,102 +522,158 @@ class UniFiParser:
         return None
 
     @staticmethod
-    def _parse_by_type(log_type: str, match: re.Match, message: str,
+    def _parse_wifi_client(data: Dict[str, Any], message: str,
+                           hostname: str, source_ip: str) -> dict:
+        """Build a WiFi client connect/disconnect event."""
+        mac = data.get('mac', 'unknown')
+        ap = data.get('ap', hostname)
+
+        # Determine if connect or disconnect; lowercase once instead of
+        # per substring test
+        msg_lower = message.lower()
+        event_status = (
+            'connected'
+            if 'connect' in msg_lower or 'join' in msg_lower
+            else 'disconnected'
+        )
+
+        out = UniFiParser._WIFI_TEMPLATE.copy()
+        out["message"] = _UNIFI_WIFI_MSG % (mac, event_status, ap)
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["entity_id"] = f"device_{mac.replace(':', '_')}"
+        out["data"] = {**data, "status": event_status}
+        return out
+
+    @staticmethod
+    def _parse_auth(data: Dict[str, Any], message: str,
+                    hostname: str, source_ip: str) -> dict:
+        """Build a network authentication event."""
+        user = data.get('user', 'unknown')
+
+        # Check if failed or successful
+        msg_lower = message.lower()
+        is_failed = (
+            'fail' in msg_lower
+            or 'deny' in msg_lower
+            or 'reject' in msg_lower
+        )
+        status = 'failed' if is_failed else 'success'
+
+        out = UniFiParser._AUTH_TEMPLATE.copy()
+        out["severity"] = SEVERITY_HIGH if is_failed else SEVERITY_LOW
+        out["message"] = _UNIFI_AUTH_MSG % (user, status)
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["user_id"] = user
+        out["data"] = {**data, "status": status}
+        return out
+
+    @staticmethod
+    def _parse_ips(data: Dict[str, Any], message: str,
+                   hostname: str, source_ip: str) -> dict:
+        """Build an IDS/IPS alert event."""
+        signature = data.get('signature', 'Unknown threat')
+        src_ip = data.get('src_ip', 'unknown')
+
+        out = UniFiParser._IPS_TEMPLATE.copy()
+        out["message"] = _UNIFI_IPS_MSG % (signature, src_ip)
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["data"] = data
+        return out
+
+    @staticmethod
+    def _parse_guest(data: Dict[str, Any], message: str,
+                     hostname: str, source_ip: str) -> dict:
+        """Build a guest portal authorization event."""
+        mac = data.get('mac', 'unknown')
+
+        out = UniFiParser._WIFI_TEMPLATE.copy()
+        out["message"] = _UNIFI_GUEST_MSG % mac
+        out["hostname"] = hostname
+        out["source_ip"] = source_ip
+        out["data"] = data
+        return out
+
+    # log type -> specialized handler, mirroring the Sophos dispatch table
+    _HANDLERS = {
+        'wifi_client': _parse_wifi_client,
+        'auth': _parse_auth,
+        'ips': _parse_ips,
+        'guest': _parse_guest,
+    }
+
+    @staticmethod
+    def _parse_by_type(log_type: str, data: Dict[str, Any], message: str,
                        hostname: str, source_ip: str) -> dict:
         """Parse based on identified log type."""
-        data = match.groupdict()
-        
-        if log_type == 'wifi_client':
-            mac = data.get('mac', 'unknown')
-            ap = data.get('ap', hostname)
-            
-            # Determine if connect or disconnect
-            event_status = 'connected' if any(x in message.lower() for x in ['connect', 'join']) else 'disconnected'
-            
-            return {
-                "event_type": EVENT_TYPE_WIFI_CLIENT,
-                "severity": SEVERITY_LOW,
-                "message": f"UniFi WiFi: Client {mac} {event_status} to {ap}",
-                "device_type": "unifi",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "entity_id": f"device_{mac.replace(':', '_')}",
-                "data": {**data, "status": event_status},
-            }
-        
-        elif log_type == 'auth':
-            user = data.get('user', 'unknown')
-            
-            # Check if failed or successful
-            is_failed = any(x in message.lower() for x in ['fail', 'deny', 'reject'])
-            severity = SEVERITY_HIGH if is_failed else SEVERITY_LOW
-            status = 'failed' if is_failed else 'success'
-            
-            return {
-                "event_type": EVENT_TYPE_NETWORK_AUTH,
-                "severity": severity,
-                "message": f"UniFi Auth: {user} - {status}",
-                "device_type": "unifi",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "user_id": user,
-                "data": {**data, "status": status},
-            }
-        
-        elif log_type == 'ips':
-            signature = data.get('signature', 'Unknown threat')
-            src_ip = data.get('src_ip', 'unknown')
-            
-            return {
-                "event_type": EVENT_TYPE_IPS_ALERT,
-                "severity": SEVERITY_HIGH,
-                "message": f"UniFi IPS Alert: {signature} from {src_ip}",
-                "device_type": "unifi",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "data": data,
-            }
-        
-        elif log_type == 'guest':
-            mac = data.get('mac', 'unknown')
-            
-            return {
-                "event_type": EVENT_TYPE_WIFI_CLIENT,
-                "severity": SEVERITY_LOW,
-                "message": f"UniFi Guest: {mac} authorized on guest portal",
-                "device_type": "unifi",
-                "hostname": hostname,
-                "source_ip": source_ip,
-                "data": data,
-            }
-        
-        return None
+        handler = UniFiParser._HANDLERS.get(log_type)
+        if handler is None:
+            return None
+        return handler(data, message, hostname, source_ip)
+
+
+# Built once at import: the automaton over the UniFi prefilter anchors,
+# or None when pyahocorasick isn't installed.
+if ahocorasick is not None:
+    _UNIFI_ANCHORS = ahocorasick.Automaton()
+    for _anchor in UniFiParser.PREFILTERS:
+        _UNIFI_ANCHORS.add_word(_anchor, _anchor)
+    _UNIFI_ANCHORS.make_automaton()
+else:
+    _UNIFI_ANCHORS = None
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(message: str, hostname: Optional[str],
+                  source_ip: Optional[str]) -> Optional[dict]:
+    """Parse one syslog line, memoized on its identifying fields.
+
+    Firewall and IPS logs repeat heavily (the same source hammering the
+    same port), so identical lines skip the parsers entirely. Callers
+    must treat the returned dict as shared and copy before mutating.
+    """
+    syslog_data = {"message": message, "source_ip": source_ip}
+    if hostname is not None:
+        syslog_data["hostname"] = hostname
+    return SophosXGSParser.parse(syslog_data) or UniFiParser.parse(syslog_data)
+
+
+def parse_cache_info():
+    """Return hit/miss statistics for the parse cache."""
+    return _parse_cached.cache_info()
 
 
 def parse_external_device(syslog_data: dict) -> Optional[dict]:
     """Parse syslog from external devices.
-    
+
     Tries parsers for known device types (Sophos, UniFi).
-    
+
     Args:
         syslog_data: Raw syslog data dictionary
-        
+
     Returns:
         Parsed event dictionary or None
     """
-    # Try Sophos parser
-    result = SophosXGSParser.parse(syslog_data)
-    if result:
-        return result
-    
-    # Try UniFi parser
-    result = UniFiParser.parse(syslog_data)
-    if result:
+    result = _parse_cached(
+        syslog_data.get("message", ""),
+        syslog_data.get("hostname"),
+        syslog_data.get("source_ip"),
+    )
+    if result is not None:
+        # Hand out copies so consumers can't mutate the cached entry
+        result = dict(result)
+        data = result.get("data")
+        if data is not None:
+            result["data"] = dict(data)
         return result
-    
-    # Unknown device - create generic event
-    _LOGGER.debug("Unknown device syslog from %s: %s", 
-                  syslog_data.get("source_ip"), 
-                  syslog_data.get("message", "")[:100])
-    
+
+    # Unknown device - only build the log arguments when debug logging
+    # is actually on; this runs for every unrecognized message
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Unknown device syslog from %s: %s",
+                      syslog_data.get("source_ip"),
+                      syslog_data.get("message", "")[:100])
+
     return None
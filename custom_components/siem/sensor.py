@@ -1,10 +1,10 @@
 """Sensor platform for SIEM Server."""
 import logging
-from datetime import timedelta
+from itertools import islice
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -16,8 +16,6 @@ from .siem_server import SiemServer
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=30)
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -27,21 +25,19 @@ async def async_setup_entry(
     """Set up SIEM Server sensors."""
     siem_server: SiemServer = hass.data[DOMAIN][entry.entry_id]
 
-    # Create coordinator for updating sensor data
-    async def async_update_data():
-        """Fetch data from SIEM server."""
-        return siem_server.get_stats()
-    
+    # Push-based coordinator: the SIEM server pushes a coalesced stats
+    # snapshot whenever events arrive, so nothing polls on an interval.
     coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
         name="siem_sensor",
-        update_method=async_update_data,
-        update_interval=SCAN_INTERVAL,
     )
 
-    # Initial refresh
-    await coordinator.async_config_entry_first_refresh()
+    # Seed with the current counters and subscribe to future pushes
+    coordinator.async_set_updated_data(siem_server.stats_snapshot())
+    entry.async_on_unload(
+        siem_server.register_stats_listener(coordinator.async_set_updated_data)
+    )
 
     # Create sensors
     sensors = [
@@ -80,6 +76,20 @@ class SiemSensorBase(CoordinatorEntity, SensorEntity):
         self._attr_name = name
         self._attr_icon = icon
         self._attr_unique_id = f"siem_{name.lower().replace(' ', '_')}"
+        self._data = coordinator.data or {}
+        self._event_types = self._data.get("event_types", {})
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Snapshot the shared stats once per refresh.
+
+        Every sensor reads the same coordinator payload; caching the
+        event_types dict here means native_value does one dict lookup
+        instead of re-fetching (and re-defaulting) it on every poll.
+        """
+        self._data = self.coordinator.data or {}
+        self._event_types = self._data.get("event_types", {})
+        super()._handle_coordinator_update()
 
     @property
     def device_info(self):
@@ -102,16 +112,15 @@ class SiemTotalEventsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("total_events", 0)
+        return self._data.get("total_events", 0)
 
     @property
     def extra_state_attributes(self):
         """Return additional attributes."""
-        stats = self.coordinator.data.get("event_types", {})
         return {
-            "max_events": self.coordinator.data.get("max_events", 0),
-            "retention_days": self.coordinator.data.get("retention_days", 0),
-            **stats,
+            "max_events": self._data.get("max_events", 0),
+            "retention_days": self._data.get("retention_days", 0),
+            **self._event_types,
         }
 
 
@@ -127,8 +136,7 @@ class SiemAuthFailuresSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("auth_failure", 0)
+        return self._event_types.get("auth_failure", 0)
 
 
 class SiemStateChangesSensor(SiemSensorBase):
@@ -143,8 +151,7 @@ class SiemStateChangesSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("state_change", 0)
+        return self._event_types.get("state_change", 0)
 
 
 class SiemServiceCallsSensor(SiemSensorBase):
@@ -159,13 +166,15 @@ class SiemServiceCallsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("service_call", 0)
+        return self._event_types.get("service_call", 0)
 
 
 class SiemCriticalEventsSensor(SiemSensorBase):
     """Sensor for critical severity events."""
 
+    # Stats key computed once at class definition instead of per poll
+    _KEY = f"severity_{SEVERITY_CRITICAL}"
+
     def __init__(self, coordinator, siem_server):
         """Initialize the sensor."""
         super().__init__(
@@ -175,13 +184,15 @@ class SiemCriticalEventsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get(f"severity_{SEVERITY_CRITICAL}", 0)
+        return self._event_types.get(self._KEY, 0)
 
 
 class SiemHighEventsSensor(SiemSensorBase):
     """Sensor for high severity events."""
 
+    # Stats key computed once at class definition instead of per poll
+    _KEY = f"severity_{SEVERITY_HIGH}"
+
     def __init__(self, coordinator, siem_server):
         """Initialize the sensor."""
         super().__init__(
@@ -191,13 +202,15 @@ class SiemHighEventsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get(f"severity_{SEVERITY_HIGH}", 0)
+        return self._event_types.get(self._KEY, 0)
 
 
 class SiemMediumEventsSensor(SiemSensorBase):
     """Sensor for medium severity events."""
 
+    # Stats key computed once at class definition instead of per poll
+    _KEY = f"severity_{SEVERITY_MEDIUM}"
+
     def __init__(self, coordinator, siem_server):
         """Initialize the sensor."""
         super().__init__(
@@ -207,13 +220,15 @@ class SiemMediumEventsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get(f"severity_{SEVERITY_MEDIUM}", 0)
+        return self._event_types.get(self._KEY, 0)
 
 
 class SiemLowEventsSensor(SiemSensorBase):
     """Sensor for low severity events."""
 
+    # Stats key computed once at class definition instead of per poll
+    _KEY = f"severity_{SEVERITY_LOW}"
+
     def __init__(self, coordinator, siem_server):
         """Initialize the sensor."""
         super().__init__(
@@ -223,8 +238,7 @@ class SiemLowEventsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get(f"severity_{SEVERITY_LOW}", 0)
+        return self._event_types.get(self._KEY, 0)
 
 
 class SiemFirewallBlocksSensor(SiemSensorBase):
@@ -239,8 +253,7 @@ class SiemFirewallBlocksSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("firewall_block", 0)
+        return self._event_types.get("firewall_block", 0)
 
 
 class SiemIPSAlertsSensor(SiemSensorBase):
@@ -255,8 +268,7 @@ class SiemIPSAlertsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("ips_alert", 0)
+        return self._event_types.get("ips_alert", 0)
 
 
 class SiemVPNConnectionsSensor(SiemSensorBase):
@@ -271,8 +283,7 @@ class SiemVPNConnectionsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("vpn_connection", 0)
+        return self._event_types.get("vpn_connection", 0)
 
 
 class SiemWiFiClientsSensor(SiemSensorBase):
@@ -287,8 +298,7 @@ class SiemWiFiClientsSensor(SiemSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        stats = self.coordinator.data.get("event_types", {})
-        return stats.get("wifi_client", 0)
+        return self._event_types.get("wifi_client", 0)
 
 
 class SiemRecentEventsSensor(SiemSensorBase):
@@ -308,7 +318,8 @@ class SiemRecentEventsSensor(SiemSensorBase):
     @property
     def extra_state_attributes(self):
         """Return the last 20 events as attributes."""
-        events = list(reversed(self._siem_server.events))[:20]
+        # Take the 20 newest without materializing the whole ring buffer
+        events = islice(reversed(self._siem_server.events), 20)
         return {
             "events": [
                 {
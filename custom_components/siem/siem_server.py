@@ -1,16 +1,21 @@
 """SIEM Server core logic."""
 import logging
 import asyncio
-import json
 import os
+import re
+import time
+import types
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from itertools import islice
 from typing import Any, Dict, List, Optional
+import orjson
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant, Event, callback, ServiceCall
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import service
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.util import dt as dt_util
 from homeassistant.const import (
     EVENT_STATE_CHANGED,
@@ -62,39 +67,185 @@ from .influxdb_handler import SiemInfluxDB
 
 _LOGGER = logging.getLogger(__name__)
 
+# Syslog messages are parsed in batches on an executor thread so the
+# regex-heavy parsers stay off the event loop. A batch is flushed when it
+# reaches this size or after this many seconds, whichever comes first.
+_SYSLOG_BATCH_SIZE = 64
+_SYSLOG_BATCH_DELAY = 0.05
+
+# Stat pushes to the sensor coordinator are coalesced over this window so
+# a burst of events produces one sensor update, not one per event.
+_STATS_PUSH_DELAY = 0.5
+
+# Security-relevant domains and (domain, service) pairs. These are
+# checked on every state change / service call HA fires, so membership
+# must be an O(1) frozenset probe, not a scan over a fresh list literal.
+_SECURITY_DOMAINS = frozenset((
+    "alarm_control_panel",
+    "lock",
+    "binary_sensor",
+    "camera",
+    "person",
+    "device_tracker",
+))
+_SECURITY_SERVICES = frozenset((
+    ("alarm_control_panel", "alarm_arm_away"),
+    ("alarm_control_panel", "alarm_arm_home"),
+    ("alarm_control_panel", "alarm_disarm"),
+    ("lock", "lock"),
+    ("lock", "unlock"),
+    ("homeassistant", "restart"),
+    ("homeassistant", "stop"),
+))
+
+# Auth-failure detection for notifications: both keywords anywhere in
+# the message, case-insensitive, in one pass — the lookaheads replace
+# three message.lower() allocations and two substring scans.
+_AUTH_FAIL_RE = re.compile(
+    r"(?=.*login)(?=.*(?:fail|invalid))", re.IGNORECASE | re.DOTALL
+)
+
+# Severity is drawn from a closed set of four constants, so the stats
+# keys can be interned once instead of f-string-built per event.
+_SEVERITY_STAT_KEYS = {
+    SEVERITY_LOW: f"severity_{SEVERITY_LOW}",
+    SEVERITY_MEDIUM: f"severity_{SEVERITY_MEDIUM}",
+    SEVERITY_HIGH: f"severity_{SEVERITY_HIGH}",
+    SEVERITY_CRITICAL: f"severity_{SEVERITY_CRITICAL}",
+}
+
+
+def _sev_alarm(tag: str, old_state, new_state) -> str:
+    """Severity for alarm panel state changes."""
+    state = new_state.state
+    if state == "triggered":
+        return SEVERITY_CRITICAL
+    if state in ("armed_away", "armed_home"):
+        return SEVERITY_MEDIUM
+    return SEVERITY_LOW
+
+
+def _sev_lock(tag: str, old_state, new_state) -> str:
+    """Severity for lock state changes."""
+    if old_state.state == "locked" and new_state.state == "unlocked":
+        return SEVERITY_HIGH
+    return SEVERITY_LOW
+
+
+def _sev_binary(tag: str, old_state, new_state) -> str:
+    """Severity for binary sensor state changes."""
+    if tag and new_state.state == "on":
+        return SEVERITY_MEDIUM
+    return SEVERITY_LOW
+
+
+# Domain-specific severity logic as a dispatch dict: one hash lookup
+# replaces the old if/elif chain of string compares per state change.
+_SEVERITY_HANDLERS = {
+    "alarm_control_panel": _sev_alarm,
+    "lock": _sev_lock,
+    "binary_sensor": _sev_binary,
+}
+
+
+def _parse_batch(batch: List[dict]) -> List[Optional[dict]]:
+    """Parse a batch of raw syslog messages (runs in an executor thread).
+
+    Failures are contained per message: one malformed datagram must not
+    cost its up-to-63 batch neighbors.
+    """
+    parsed: List[Optional[dict]] = []
+    for syslog_data in batch:
+        try:
+            parsed.append(parse_external_device(syslog_data))
+        except Exception as err:
+            _LOGGER.error("Error parsing external device data: %s", err)
+            parsed.append(None)
+    return parsed
+
+
+def _write_export(path: str, data_bytes: bytes):
+    """Write the JSON export to disk (runs in an executor thread)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data_bytes)
+
 
 class SiemEvent:
     """Represents a SIEM event."""
 
+    # Thousands of these sit in the ring buffer at once; slots drop the
+    # per-instance __dict__ and make attribute access a fixed offset.
+    __slots__ = (
+        "timestamp_ns",
+        "event_type",
+        "severity",
+        "_message",
+        "entity_id",
+        "user_id",
+        "data",
+        "_dict_cache",
+    )
+
     def __init__(
         self,
         event_type: str,
         severity: str,
-        message: str,
+        message,
         entity_id: Optional[str] = None,
         user_id: Optional[str] = None,
         data: Optional[Dict[str, Any]] = None,
     ):
-        """Initialize SIEM event."""
-        self.timestamp = datetime.now()
+        """Initialize SIEM event.
+
+        message may be a plain str or a (template, args) pair for
+        %-formatting; the pair is only rendered the first time the
+        message is actually read, so events nobody ever displays skip
+        the string build entirely.
+        """
+        # A bare int from time_ns() instead of a datetime: no object
+        # allocation on the hot ingest path, and age checks become
+        # integer compares. The datetime is built on demand.
+        self.timestamp_ns = time.time_ns()
         self.event_type = event_type
         self.severity = severity
-        self.message = message
+        self._message = message
         self.entity_id = entity_id
         self.user_id = user_id
         self.data = data or {}
+        self._dict_cache: Optional[Dict[str, Any]] = None
+
+    @property
+    def message(self) -> str:
+        """Event message, rendered lazily if stored as (template, args)."""
+        msg = self._message
+        if type(msg) is tuple:
+            msg = msg[0] % msg[1]
+            self._message = msg
+        return msg
+
+    @property
+    def timestamp(self) -> datetime:
+        """Event time as a datetime, built lazily from the stored int."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert event to dictionary."""
-        return {
-            ATTR_TIMESTAMP: self.timestamp.isoformat(),
-            ATTR_EVENT_TYPE: self.event_type,
-            ATTR_SEVERITY: self.severity,
-            ATTR_MESSAGE: self.message,
-            ATTR_ENTITY_ID: self.entity_id,
-            ATTR_USER_ID: self.user_id,
-            ATTR_DATA: self.data,
-        }
+        """Convert event to dictionary.
+
+        Events are immutable once recorded, so the dict is built once and
+        cached; repeated API queries reuse it instead of re-serializing.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                ATTR_TIMESTAMP: self.timestamp.isoformat(),
+                ATTR_EVENT_TYPE: self.event_type,
+                ATTR_SEVERITY: self.severity,
+                ATTR_MESSAGE: self.message,
+                ATTR_ENTITY_ID: self.entity_id,
+                ATTR_USER_ID: self.user_id,
+                ATTR_DATA: self.data,
+            }
+        return self._dict_cache
 
 
 class SiemServer:
@@ -104,10 +255,34 @@ class SiemServer:
         """Initialize SIEM server."""
         self.hass = hass
         self.entry = entry
+        # Resolve the config-entry options once into plain attributes;
+        # the hot paths then read a slot instead of walking two dicts
+        # with defaults on every access.
+        self._cache_config()
+        self._unsub_options = None
         self.stats = defaultdict(int)
+        # In-memory ring buffer of recent events plus per-field secondary
+        # indexes so filtered queries don't have to scan the whole buffer.
+        self.events = deque(maxlen=self._get_max_events())
+        # Bumped on every ingest/clear; used by the API view to
+        # invalidate cached query responses.
+        self.version = 0
+        # Small hot buffer of the newest events for the common
+        # unfiltered "show latest" API query.
+        self.recent = deque(maxlen=1024)
+        self.events_by_type = defaultdict(deque)
+        self.events_by_entity = defaultdict(deque)
+        self.events_by_severity = defaultdict(deque)
         self._listeners = []
-        self._cleanup_task = None
+        # entity_id -> "motion"/"door"/"window"/"" — the substring scan
+        # for binary sensor naming runs once per entity, not per change
+        self._sensor_tag: Dict[str, str] = {}
+        self._unsub_cleanup = None
         self._syslog_server: Optional[SyslogServer] = None
+        self._syslog_batch: List[dict] = []
+        self._syslog_flush_handle = None
+        self._stats_listeners: List = []
+        self._stats_push_unsub = None
         self._storage_path = hass.config.path(".storage", "siem_events.json")
         self._save_task = None
         
@@ -120,26 +295,38 @@ class SiemServer:
             _LOGGER.error("Failed to initialize InfluxDB: %s", err)
             raise
     
-    @property
-    def events(self):
-        """Get recent events from InfluxDB (for backwards compatibility)."""
-        if self.influx:
-            return self.influx.query_events(limit=1000)
-        return []
+    def _cache_config(self):
+        """Snapshot entry options/data into plain attributes."""
+        options = self.entry.options
+        data = self.entry.data
+        self._max_events = options.get(
+            CONF_MAX_EVENTS, data.get(CONF_MAX_EVENTS, DEFAULT_MAX_EVENTS)
+        )
+        self._retention_days = options.get(
+            CONF_RETENTION_DAYS,
+            data.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS),
+        )
+        self._syslog_enabled = options.get(
+            CONF_ENABLE_SYSLOG, data.get(CONF_ENABLE_SYSLOG, True)
+        )
+        self._syslog_port = options.get(
+            CONF_SYSLOG_PORT, data.get(CONF_SYSLOG_PORT, DEFAULT_SYSLOG_PORT)
+        )
+        self._syslog_host = options.get(
+            CONF_SYSLOG_HOST, data.get(CONF_SYSLOG_HOST, DEFAULT_SYSLOG_HOST)
+        )
+
+    async def _async_options_updated(self, hass, entry):
+        """Refresh the cached config when the entry's options change."""
+        self._cache_config()
 
     def _get_max_events(self) -> int:
         """Get max events from config."""
-        return self.entry.options.get(
-            CONF_MAX_EVENTS,
-            self.entry.data.get(CONF_MAX_EVENTS, DEFAULT_MAX_EVENTS),
-        )
+        return self._max_events
 
     def _get_retention_days(self) -> int:
         """Get retention days from config."""
-        return self.entry.options.get(
-            CONF_RETENTION_DAYS,
-            self.entry.data.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS),
-        )
+        return self._retention_days
 
     async def async_initialize(self):
         """Initialize the SIEM server."""
@@ -172,12 +359,20 @@ class SiemServer:
         # Register services
         self._register_services()
 
+        # Keep the cached config in sync with option changes
+        self._unsub_options = self.entry.add_update_listener(
+            self._async_options_updated
+        )
+
         # Start syslog server if enabled
         if self._is_syslog_enabled():
             await self._start_syslog_server()
 
-        # Start cleanup task
-        self._cleanup_task = asyncio.create_task(self._cleanup_old_events())
+        # Schedule hourly retention cleanup; a timer callback keeps the
+        # event loop free of an idle long-lived task between runs
+        self._unsub_cleanup = async_track_time_interval(
+            self.hass, self._cleanup_old_events, timedelta(hours=1)
+        )
 
         _LOGGER.info("SIEM Server initialized successfully")
 
@@ -196,7 +391,21 @@ class SiemServer:
             except asyncio.CancelledError:
                 pass
 
-        # Stop syslog server
+        # Stop listening for option updates
+        if self._unsub_options is not None:
+            self._unsub_options()
+            self._unsub_options = None
+
+        # Cancel any pending coalesced stats push
+        if self._stats_push_unsub is not None:
+            self._stats_push_unsub()
+            self._stats_push_unsub = None
+
+        # Stop syslog server and drain any partially filled batch
+        if self._syslog_flush_handle is not None:
+            self._syslog_flush_handle.cancel()
+            self._syslog_flush_handle = None
+        await self._flush_syslog_batch()
         if self._syslog_server:
             await self._syslog_server.stop()
 
@@ -205,34 +414,22 @@ class SiemServer:
             remove_listener()
         self._listeners.clear()
 
-        # Cancel cleanup task
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        # Stop the periodic retention cleanup
+        if self._unsub_cleanup is not None:
+            self._unsub_cleanup()
+            self._unsub_cleanup = None
 
     def _is_syslog_enabled(self) -> bool:
         """Check if syslog server is enabled."""
-        return self.entry.options.get(
-            CONF_ENABLE_SYSLOG,
-            self.entry.data.get(CONF_ENABLE_SYSLOG, True),
-        )
+        return self._syslog_enabled
 
     def _get_syslog_port(self) -> int:
         """Get syslog server port."""
-        return self.entry.options.get(
-            CONF_SYSLOG_PORT,
-            self.entry.data.get(CONF_SYSLOG_PORT, DEFAULT_SYSLOG_PORT),
-        )
+        return self._syslog_port
 
     def _get_syslog_host(self) -> str:
         """Get syslog server host."""
-        return self.entry.options.get(
-            CONF_SYSLOG_HOST,
-            self.entry.data.get(CONF_SYSLOG_HOST, DEFAULT_SYSLOG_HOST),
-        )
+        return self._syslog_host
 
     async def _start_syslog_server(self):
         """Start the syslog server for external devices."""
@@ -244,6 +441,9 @@ class SiemServer:
                 host=host,
                 port=port,
                 callback=self._handle_syslog_event,
+                # 12 MiB receive buffer so firewall log bursts are not
+                # dropped before we see them (capped by net.core.rmem_max)
+                rcvbuf=12 * 1024 * 1024,
             )
             
             await self._syslog_server.start()
@@ -253,42 +453,82 @@ class SiemServer:
             _LOGGER.error("Failed to start syslog server: %s", err)
             self._syslog_server = None
 
-    async def _handle_syslog_event(self, syslog_data: dict):
+    @callback
+    def _handle_syslog_event(self, syslog_data: dict):
         """Handle syslog event from external device.
-        
+
+        Called synchronously from the datagram protocol, so a burst of
+        packets costs one queue append each instead of one task each.
+
         Args:
             syslog_data: Raw syslog data from syslog_server
         """
+        # Accumulate messages and parse them in one executor hop; under a
+        # log storm this keeps the loop responsive and amortizes the
+        # thread hand-off across the whole batch.
+        self._syslog_batch.append(syslog_data)
+        if len(self._syslog_batch) >= _SYSLOG_BATCH_SIZE:
+            if self._syslog_flush_handle is not None:
+                self._syslog_flush_handle.cancel()
+                self._syslog_flush_handle = None
+            self.hass.async_create_task(self._flush_syslog_batch())
+        elif self._syslog_flush_handle is None:
+            self._syslog_flush_handle = self.hass.loop.call_later(
+                _SYSLOG_BATCH_DELAY, self._schedule_syslog_flush
+            )
+
+    @callback
+    def _schedule_syslog_flush(self):
+        """Flush a partial syslog batch once the batching delay expires."""
+        self._syslog_flush_handle = None
+        self.hass.async_create_task(self._flush_syslog_batch())
+
+    async def _flush_syslog_batch(self):
+        """Parse the pending syslog batch and record the resulting events."""
+        batch = self._syslog_batch
+        if not batch:
+            return
+        self._syslog_batch = []
         try:
-            # Parse the syslog message using device-specific parsers
-            parsed_event = parse_external_device(syslog_data)
-            
+            parsed_events = await self.hass.async_add_executor_job(
+                _parse_batch, batch
+            )
+        except Exception as err:
+            _LOGGER.error("Error parsing syslog batch: %s", err)
+            return
+
+        # Tight drain loop: bind the per-iteration lookups once
+        make_event = SiemEvent
+        add_event = self._add_event
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        for parsed_event in parsed_events:
             if parsed_event:
+                # parse_external_device hands out a caller-owned copy, so
+                # the extra keys can be added in place instead of merging
+                # into yet another dict per packet
+                pdata = parsed_event.get("data") or {}
+                pdata["device_type"] = parsed_event.get("device_type", "unknown")
+                pdata["hostname"] = parsed_event.get("hostname", "unknown")
+                pdata["source_ip"] = parsed_event.get("source_ip", "unknown")
+
                 # Create SIEM event from parsed data
-                siem_event = SiemEvent(
+                siem_event = make_event(
                     event_type=parsed_event.get("event_type", "external_event"),
                     severity=parsed_event.get("severity", SEVERITY_LOW),
                     message=parsed_event.get("message", "External device event"),
                     entity_id=parsed_event.get("entity_id"),
                     user_id=parsed_event.get("user_id"),
-                    data={
-                        **parsed_event.get("data", {}),
-                        "device_type": parsed_event.get("device_type", "unknown"),
-                        "hostname": parsed_event.get("hostname", "unknown"),
-                        "source_ip": parsed_event.get("source_ip", "unknown"),
-                    },
+                    data=pdata,
                 )
                 
-                self._add_event(siem_event)
+                add_event(siem_event)
                 
-                _LOGGER.debug(
-                    "External device event: %s from %s",
-                    parsed_event.get("event_type"),
-                    parsed_event.get("source_ip"),
-                )
-            
-        except Exception as err:
-            _LOGGER.error("Error handling syslog event: %s", err)
+                if debug:
+                    _LOGGER.debug(
+                        "External device event: %s from %s",
+                        parsed_event.get("event_type"),
+                        parsed_event.get("source_ip"),
+                    )
 
     def _register_services(self):
         """Register SIEM services."""
@@ -303,6 +543,7 @@ class SiemServer:
                 vol.Optional(ATTR_ENTITY_ID): str,
                 vol.Optional(ATTR_SEVERITY): str,
                 vol.Optional("limit", default=100): vol.Coerce(int),
+                vol.Optional("fire_event", default=False): bool,
             }),
         )
 
@@ -318,42 +559,56 @@ class SiemServer:
             DOMAIN,
             SERVICE_GET_STATS,
             self._handle_get_stats,
+            schema=vol.Schema({
+                vol.Optional("fire_event", default=False): bool,
+            }),
         )
 
     @callback
     def _handle_state_changed(self, event: Event):
         """Handle state changed events."""
-        entity_id = event.data.get("entity_id")
-        old_state = event.data.get("old_state")
-        new_state = event.data.get("new_state")
+        # Fired for every state change in HA — gate on the domain first
+        # so the overwhelmingly common non-security case costs one dict
+        # read, one partition and one frozenset probe
+        data = event.data
+        entity_id = data["entity_id"]
+        domain = entity_id.partition(".")[0]
+        if domain not in _SECURITY_DOMAINS:
+            return
 
+        old_state = data.get("old_state")
+        new_state = data.get("new_state")
         if old_state is None or new_state is None:
             return
 
-        # Track state changes for security-relevant entities
-        if self._is_security_entity(entity_id):
-            severity = self._calculate_severity(entity_id, old_state, new_state)
-            siem_event = SiemEvent(
-                event_type=EVENT_TYPE_STATE_CHANGE,
-                severity=severity,
-                message=f"State changed: {entity_id} from {old_state.state} to {new_state.state}",
-                entity_id=entity_id,
-                data={
-                    "old_state": old_state.state,
-                    "new_state": new_state.state,
-                },
-            )
-            self._add_event(siem_event)
+        severity = self._calculate_severity(
+            entity_id, old_state, new_state, domain
+        )
+        siem_event = SiemEvent(
+            event_type=EVENT_TYPE_STATE_CHANGE,
+            severity=severity,
+            message=(
+                "State changed: %s from %s to %s",
+                (entity_id, old_state.state, new_state.state),
+            ),
+            entity_id=entity_id,
+            data={
+                "old_state": old_state.state,
+                "new_state": new_state.state,
+            },
+        )
+        self._add_event(siem_event)
 
     @callback
     def _handle_service_call(self, event: Event):
         """Handle service call events."""
-        domain = event.data.get("domain")
-        service_name = event.data.get("service")
-        service_data = event.data.get("service_data", {})
+        data = event.data
+        domain = data.get("domain")
+        service_name = data.get("service")
+        service_data = data.get("service_data", {})
 
         # Track security-relevant service calls
-        if self._is_security_service(domain, service_name):
+        if (domain, service_name) in _SECURITY_SERVICES:
             siem_event = SiemEvent(
                 event_type=EVENT_TYPE_SERVICE_CALL,
                 severity=SEVERITY_MEDIUM,
@@ -361,7 +616,10 @@ class SiemServer:
                 data={
                     "domain": domain,
                     "service": service_name,
-                    "service_data": service_data,
+                    # Bounded repr, not the dict itself: the live payload
+                    # may reference large templates/blueprints that would
+                    # otherwise be pinned for the event's whole lifetime
+                    "service_data": repr(service_data)[:512],
                 },
             )
             self._add_event(siem_event)
@@ -369,97 +627,105 @@ class SiemServer:
     @callback
     def _handle_automation_triggered(self, event: Event):
         """Handle automation triggered events."""
-        name = event.data.get("name")
-        entity_id = event.data.get("entity_id")
+        data = event.data
+        name = data.get("name")
+        entity_id = data.get("entity_id")
 
         siem_event = SiemEvent(
             event_type=EVENT_TYPE_AUTOMATION_TRIGGER,
             severity=SEVERITY_LOW,
             message=f"Automation triggered: {name}",
             entity_id=entity_id,
-            data=event.data,
+            # Copy only the fields we display; storing event.data itself
+            # would keep the whole HA payload alive in the ring buffer
+            data={"name": name, "entity_id": entity_id, "source": data.get("source")},
         )
         self._add_event(siem_event)
 
     @callback
     def _handle_script_started(self, event: Event):
         """Handle script started events."""
-        name = event.data.get("name")
-        entity_id = event.data.get("entity_id")
+        data = event.data
+        name = data.get("name")
+        entity_id = data.get("entity_id")
 
         siem_event = SiemEvent(
             event_type=EVENT_TYPE_SCRIPT_RUN,
             severity=SEVERITY_LOW,
             message=f"Script started: {name}",
             entity_id=entity_id,
-            data=event.data,
+            # Same whitelist copy as the automation handler
+            data={"name": name, "entity_id": entity_id},
         )
         self._add_event(siem_event)
 
     @callback
     def _handle_notification(self, event: Event):
         """Handle notification events for auth failures."""
-        message = event.data.get("message", "")
+        data = event.data
+        message = data.get("message", "")
         
         # Detect authentication failures
-        if "login" in message.lower() and ("fail" in message.lower() or "invalid" in message.lower()):
+        if _AUTH_FAIL_RE.match(message):
             siem_event = SiemEvent(
                 event_type=EVENT_TYPE_AUTH_FAILURE,
                 severity=SEVERITY_HIGH,
                 message=f"Authentication failure detected: {message}",
-                data=event.data,
+                data=data,
             )
             self._add_event(siem_event)
 
     def _is_security_entity(self, entity_id: str) -> bool:
         """Check if entity is security-relevant."""
-        security_domains = [
-            "alarm_control_panel",
-            "lock",
-            "binary_sensor",
-            "camera",
-            "person",
-            "device_tracker",
-        ]
-        domain = entity_id.split(".")[0] if "." in entity_id else ""
-        return domain in security_domains
+        return entity_id.partition(".")[0] in _SECURITY_DOMAINS
 
     def _is_security_service(self, domain: str, service: str) -> bool:
         """Check if service call is security-relevant."""
-        security_services = [
-            ("alarm_control_panel", "alarm_arm_away"),
-            ("alarm_control_panel", "alarm_arm_home"),
-            ("alarm_control_panel", "alarm_disarm"),
-            ("lock", "lock"),
-            ("lock", "unlock"),
-            ("homeassistant", "restart"),
-            ("homeassistant", "stop"),
-        ]
-        return (domain, service) in security_services
+        return (domain, service) in _SECURITY_SERVICES
 
-    def _calculate_severity(self, entity_id: str, old_state, new_state) -> str:
+    def _calculate_severity(self, entity_id: str, old_state, new_state,
+                            domain: Optional[str] = None) -> str:
         """Calculate severity based on state change."""
-        domain = entity_id.split(".")[0] if "." in entity_id else ""
-        
-        if domain == "alarm_control_panel":
-            if new_state.state == "triggered":
-                return SEVERITY_CRITICAL
-            elif new_state.state in ["armed_away", "armed_home"]:
-                return SEVERITY_MEDIUM
-        
-        elif domain == "lock":
-            if old_state.state == "locked" and new_state.state == "unlocked":
-                return SEVERITY_HIGH
-        
-        elif domain == "binary_sensor":
-            if "motion" in entity_id or "door" in entity_id or "window" in entity_id:
-                if new_state.state == "on":
-                    return SEVERITY_MEDIUM
-        
-        return SEVERITY_LOW
+        if domain is None:
+            domain = entity_id.partition(".")[0]
+
+        handler = _SEVERITY_HANDLERS.get(domain)
+        if handler is None:
+            return SEVERITY_LOW
+
+        tag = self._sensor_tag.get(entity_id)
+        if tag is None:
+            tag = next(
+                (t for t in ("motion", "door", "window") if t in entity_id), ""
+            )
+            self._sensor_tag[entity_id] = tag
+        return handler(tag, old_state, new_state)
+
+    def _index_event(self, event: SiemEvent):
+        """Append event to the ring buffer and secondary indexes."""
+        events = self.events
+        if events.maxlen is not None and len(events) == events.maxlen:
+            # The append below evicts the oldest event; drop it from its
+            # indexes too. Index deques share the main buffer's ordering,
+            # so the evicted event is at the left of each of them.
+            evicted = events[0]
+            self.events_by_type[evicted.event_type].popleft()
+            self.events_by_severity[evicted.severity].popleft()
+            if evicted.entity_id:
+                self.events_by_entity[evicted.entity_id].popleft()
+
+        events.append(event)
+        self.version += 1
+        self.recent.append(event)
+        self.events_by_type[event.event_type].append(event)
+        self.events_by_severity[event.severity].append(event)
+        if event.entity_id:
+            self.events_by_entity[event.entity_id].append(event)
 
     def _add_event(self, event: SiemEvent):
-        """Add event to InfluxDB."""
+        """Add event to the in-memory buffer and InfluxDB."""
+        self._index_event(event)
+
         # Write to InfluxDB
         if self.influx:
             try:
@@ -468,36 +734,122 @@ class SiemServer:
                 _LOGGER.error("Failed to write event to InfluxDB: %s", err)
         
         # Update stats
-        self.stats[event.event_type] += 1
-        self.stats[f"severity_{event.severity}"] += 1
-        self.stats["total_events"] += 1
-
-        _LOGGER.debug(
-            "SIEM event recorded: %s - %s - %s",
-            event.event_type,
-            event.severity,
-            event.message,
-        )
+        severity_key = _SEVERITY_STAT_KEYS.get(event.severity)
+        if severity_key is None:
+            severity_key = f"severity_{event.severity}"
+        stats = self.stats
+        stats[event.event_type] += 1
+        stats[severity_key] += 1
+        stats["total_events"] += 1
 
-    async def _cleanup_old_events(self):
-        """Periodically cleanup old events from InfluxDB."""
-        while True:
-            try:
-                await asyncio.sleep(3600)  # Run every hour
-                
-                # InfluxDB retention policy handles automatic cleanup
-                # This is just for logging and manual cleanup if needed
-                retention_days = self._get_retention_days()
-                
-                if self.influx:
-                    # Optional: manually delete old events
-                    # InfluxDB retention policy already handles this automatically
-                    _LOGGER.debug("InfluxDB retention policy active: %d days", retention_days)
-                    
-            except asyncio.CancelledError:
-                break
-            except Exception as err:
-                _LOGGER.error("Error during SIEM cleanup: %s", err)
+        self._schedule_stats_push()
+
+        # Hottest call site in the module: skip the logging call outright
+        # unless debug is actually enabled
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "SIEM event recorded: %s - %s - %s",
+                event.event_type,
+                event.severity,
+                event.message,
+            )
+
+    async def _cleanup_old_events(self, _now=None):
+        """Evict events past retention; runs hourly from the interval timer."""
+        try:
+            # InfluxDB retention policy handles automatic cleanup
+            # This is just for logging and manual cleanup if needed
+            retention_days = self._get_retention_days()
+
+            # The in-memory ring is appended in arrival order, so
+            # retention eviction is an O(removed) left-pop loop —
+            # no scan or rebuild of the deque. The index deques
+            # share the main buffer's ordering, so the evicted
+            # event sits at the left of each of them.
+            cutoff = time.time_ns() - retention_days * 86_400 * 10**9
+            events = self.events
+            removed = 0
+            while events and events[0].timestamp_ns <= cutoff:
+                evicted = events.popleft()
+                self.events_by_type[evicted.event_type].popleft()
+                self.events_by_severity[evicted.severity].popleft()
+                if evicted.entity_id:
+                    self.events_by_entity[evicted.entity_id].popleft()
+                removed += 1
+            recent = self.recent
+            while recent and recent[0].timestamp_ns <= cutoff:
+                recent.popleft()
+            if removed:
+                self.version += 1
+                _LOGGER.debug(
+                    "Evicted %d events past retention", removed
+                )
+
+            if self.influx:
+                # Optional: manually delete old events
+                # InfluxDB retention policy already handles this automatically
+                _LOGGER.debug("InfluxDB retention policy active: %d days", retention_days)
+
+        except Exception as err:
+            _LOGGER.error("Error during SIEM cleanup: %s", err)
+
+    def _query_memory(self, event_type, entity_id, severity, limit) -> List[dict]:
+        """Serve a filtered query from the ring buffer via its indexes.
+
+        The per-field index deques let selective queries walk only
+        matching events instead of scanning the whole buffer — the same
+        candidate selection the HTTP API view uses.
+        """
+        candidates = self.events
+        residual_filter = False
+        if event_type or entity_id or severity:
+            # .get with a tuple default so service-call filter values
+            # can't seed permanent empty deques in the defaultdicts
+            indexed = [
+                self.events_by_type.get(event_type, ())
+                if event_type else None,
+                self.events_by_entity.get(entity_id, ())
+                if entity_id else None,
+                self.events_by_severity.get(severity, ())
+                if severity else None,
+            ]
+            active = [d for d in indexed if d is not None]
+            candidates = min(active, key=len)
+            residual_filter = len(active) > 1
+
+        if not residual_filter:
+            # No filters, or a single filter fully answered by its index:
+            # every candidate matches, so just take the newest limit.
+            return [
+                event.to_dict()
+                for event in islice(reversed(candidates), limit)
+            ]
+
+        # Multiple filters: snapshot a bounded right-slice of the chosen
+        # index once, then filter in a plain list comprehension — the hot
+        # loop runs over a list with locals instead of a deque reverse
+        # iterator with attribute lookups per element.
+        cap = max(limit * 8, 1024)
+        recent_slice = list(islice(reversed(candidates), cap))
+        matches = [
+            event
+            for event in recent_slice
+            if (not event_type or event.event_type == event_type)
+            and (not entity_id or event.entity_id == entity_id)
+            and (not severity or event.severity == severity)
+        ]
+        if len(matches) < limit and len(candidates) > cap:
+            # Selective combination: keep walking past the sampled slice
+            # so the result stays as complete as the old full scan
+            more = (
+                event
+                for event in islice(reversed(candidates), cap, None)
+                if (not event_type or event.event_type == event_type)
+                and (not entity_id or event.entity_id == entity_id)
+                and (not severity or event.severity == severity)
+            )
+            matches.extend(islice(more, limit - len(matches)))
+        return [event.to_dict() for event in matches[:limit]]
 
     async def _handle_query_events(self, call: ServiceCall):
         """Handle query events service."""
@@ -506,9 +858,13 @@ class SiemServer:
         severity = call.data.get(ATTR_SEVERITY)
         limit = call.data.get("limit", 100)
 
-        # Query from InfluxDB
-        filtered_events = []
-        if self.influx:
+        # Serve from the in-memory ring via its indexes; only fall back
+        # to the blocking InfluxDB query when the ring has nothing (e.g.
+        # right after a restart)
+        filtered_events = self._query_memory(
+            event_type, entity_id, severity, limit
+        )
+        if not filtered_events and self.influx:
             filtered_events = await self.hass.async_add_executor_job(
                 self.influx.query_events,
                 limit,
@@ -523,13 +879,16 @@ class SiemServer:
             )
 
         _LOGGER.info("Query returned %d events", len(filtered_events))
-        
-        # Fire event with results
-        self.hass.bus.async_fire(
-            f"{DOMAIN}_query_result",
-            {"events": filtered_events, "count": len(filtered_events)},
-        )
-        
+
+        # The service response already carries the results; the bus fire
+        # is opt-in for legacy callers since every fire dispatches to all
+        # bus listeners in the installation.
+        if call.data.get("fire_event"):
+            self.hass.bus.async_fire(
+                f"{DOMAIN}_query_result",
+                {"events": filtered_events, "count": len(filtered_events)},
+            )
+
         # Return data for service response
         return {
             "events": filtered_events,
@@ -538,11 +897,18 @@ class SiemServer:
 
     async def _handle_clear_events(self, call: ServiceCall):
         """Handle clear events service."""
+        self.events.clear()
+        self.version += 1
+        self.recent.clear()
+        self.events_by_type.clear()
+        self.events_by_entity.clear()
+        self.events_by_severity.clear()
         if self.influx:
             await self.hass.async_add_executor_job(
                 self.influx.clear_all_events
             )
         self.stats.clear()
+        self._schedule_stats_push()
         _LOGGER.info("Cleared all SIEM events from InfluxDB")
 
     async def _handle_get_stats(self, call: ServiceCall):
@@ -553,14 +919,59 @@ class SiemServer:
                 self.influx.get_statistics
             )
         
-        self.hass.bus.async_fire(
-            f"{DOMAIN}_stats_result",
-            stats_data,
-        )
-        
+        # Bus fire is opt-in, same as query_events
+        if call.data.get("fire_event"):
+            self.hass.bus.async_fire(
+                f"{DOMAIN}_stats_result",
+                stats_data,
+            )
+
         # Return data for service response
         return stats_data
 
+    def register_stats_listener(self, listener):
+        """Register a callback receiving pushed stats snapshots.
+
+        Returns a function that removes the listener again.
+        """
+        self._stats_listeners.append(listener)
+
+        def _unregister():
+            self._stats_listeners.remove(listener)
+
+        return _unregister
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        """Build a sensor-ready snapshot from the in-memory counters.
+
+        event_types is a read-only live view, not a copy: the sensors
+        only read it, so there is no reason to duplicate dozens of
+        counters on every push.
+        """
+        return {
+            "total_events": self.stats["total_events"],
+            "event_types": types.MappingProxyType(self.stats),
+            "max_events": self._get_max_events(),
+            "retention_days": self._get_retention_days(),
+        }
+
+    @callback
+    def _schedule_stats_push(self):
+        """Arm a coalesced stats push to the registered listeners."""
+        if self._stats_push_unsub is not None or not self._stats_listeners:
+            return
+        self._stats_push_unsub = async_call_later(
+            self.hass, _STATS_PUSH_DELAY, self._push_stats
+        )
+
+    @callback
+    def _push_stats(self, _now):
+        """Deliver one snapshot covering everything since the last push."""
+        self._stats_push_unsub = None
+        snapshot = self.stats_snapshot()
+        for listener in self._stats_listeners:
+            listener(snapshot)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics."""
         if self.influx:
@@ -571,7 +982,7 @@ class SiemServer:
         
         return {
             "total_events": 0,
-            "event_types": dict(self.stats),
+            "event_types": types.MappingProxyType(self.stats),
             "max_events": 0,
             "retention_days": self._get_retention_days(),
         }
@@ -614,10 +1025,16 @@ class SiemServer:
 
                 # Write to www directory for web viewer
                 www_path = self.hass.config.path("www", "siem_events.json")
-                os.makedirs(os.path.dirname(www_path), exist_ok=True)
-                
-                with open(www_path, 'w') as f:
-                    json.dump(data, f, indent=2)
+
+                # One-shot C serialization and a single write instead of
+                # json.dump's per-element string building; the disk write
+                # runs on an executor so the loop never blocks on I/O
+                data_bytes = orjson.dumps(
+                    data, default=str, option=orjson.OPT_INDENT_2
+                )
+                await self.hass.async_add_executor_job(
+                    _write_export, www_path, data_bytes
+                )
                 
                 _LOGGER.debug("Exported %d events to JSON backup", len(events))
 
@@ -1,52 +1,187 @@
 """Syslog server for receiving logs from external devices."""
 import asyncio
 import logging
+import re
 import socket
-from datetime import datetime
+import time
 from typing import Callable, Optional
 
 _LOGGER = logging.getLogger(__name__)
 
+# Precompiled at import: the per-datagram header parse is a couple of
+# C-level regex matches instead of split/join/char-loop work per packet.
+_PRI_RE = re.compile(r"^<(\d{1,3})>")
+# RFC 3164 heuristic: timestamp token, hostname token, then tag/message
+_RFC3164_RE = re.compile(r"^(\S+)\s+(\S+)\s+(\S.*)$", re.DOTALL)
+# Hostname or IPv4: alphanumerics plus . - _
+_HOST_RE = re.compile(r"[\w.\-]+")
+_TAG_RE = re.compile(r"^([^:]*):(.*)$", re.DOTALL)
+
+# Datagrams drained from the socket per event-loop wake-up. One reader
+# callback pulls up to this many packets instead of the loop dispatching
+# a separate callback per packet.
+_DRAIN_BATCH = 64
+# Max UDP payload: recvfrom silently truncates datagrams larger than
+# the buffer, and long Sophos web-filter lines exceed 2 KiB
+_RECV_SIZE = 65535
+
+
+def _parse_syslog(message: str, source_ip: str) -> dict:
+    """Parse syslog message into structured data.
+
+    RFC 3164 format: <PRI>TIMESTAMP HOSTNAME TAG: MESSAGE
+    RFC 5424 format: <PRI>VERSION TIMESTAMP HOSTNAME APP-NAME PROCID MSGID SD MESSAGE
+
+    Args:
+        message: Raw syslog message
+        source_ip: Source IP address
+
+    Returns:
+        Dictionary with parsed syslog data
+    """
+    data = {
+        "raw_message": message,
+        "source_ip": source_ip,
+        # Bare int, no datetime construction per packet; consumers that
+        # need wall-clock time can divide by 1e9
+        "timestamp_ns": time.time_ns(),
+        "facility": None,
+        "severity": None,
+        "hostname": None,
+        "tag": None,
+        "message": message,
+    }
+
+    try:
+        # Parse priority (PRI) if present
+        pri_match = _PRI_RE.match(message)
+        if pri_match:
+            pri = int(pri_match.group(1))
+            data["facility"] = pri >> 3
+            data["severity"] = pri & 0x07
+            message = message[pri_match.end():].strip()
+
+        # Try to parse RFC 3164 format: drop the timestamp token,
+        # then take hostname and tag/message if the second token
+        # looks like a hostname
+        header = _RFC3164_RE.match(message)
+        if header:
+            hostname = header.group(2)
+            if _HOST_RE.fullmatch(hostname):
+                data["hostname"] = hostname
+                tag_msg = header.group(3)
+                tag_match = _TAG_RE.match(tag_msg)
+                if tag_match:
+                    data["tag"] = tag_match.group(1).strip()
+                    data["message"] = tag_match.group(2).strip()
+                else:
+                    data["message"] = tag_msg
+            else:
+                data["hostname"] = source_ip
+                data["message"] = "%s %s" % (hostname, header.group(3))
+
+    except Exception as err:
+        _LOGGER.debug("Error parsing syslog structure: %s", err)
+        # Keep raw message as fallback
+
+    return data
+
 
 class SyslogServer:
     """UDP Syslog server to receive logs from external devices."""
 
-    def __init__(self, host: str, port: int, callback: Callable):
+    def __init__(self, host: str, port: int, callback: Callable, rcvbuf: int = 0):
         """Initialize syslog server.
-        
+
         Args:
             host: Host IP to bind to (usually '0.0.0.0')
             port: Port to listen on (default: 514)
-            callback: Async callback function to handle parsed events
+            callback: Synchronous callback invoked with each parsed message
+            rcvbuf: Requested SO_RCVBUF size in bytes (0 = kernel default).
+                The kernel caps this at net.core.rmem_max; to actually get
+                large buffers raise the sysctl first, e.g.
+                ``net.core.rmem_max=12582912`` and
+                ``net.core.netdev_max_backlog=5000``.
         """
         self.host = host
         self.port = port
         self.callback = callback
-        self.transport = None
+        self.rcvbuf = rcvbuf
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._running = False
 
     async def start(self):
         """Start the syslog server."""
         try:
             loop = asyncio.get_event_loop()
-            
-            # Create UDP endpoint
-            self.transport, _ = await loop.create_datagram_endpoint(
-                lambda: SyslogProtocol(self.callback),
-                local_addr=(self.host, self.port),
-            )
-            
+
+            # Build the socket ourselves so buffer options are applied
+            # before bind: a larger receive buffer absorbs bursts from
+            # chatty firewalls that would otherwise be dropped kernel-side.
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            if self.rcvbuf > 0:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+                # The kernel caps the request at net.core.rmem_max (and
+                # reports double the usable size); log what we really got
+                effective = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+                _LOGGER.info(
+                    "Syslog SO_RCVBUF: requested %d, effective %d",
+                    self.rcvbuf,
+                    effective,
+                )
+            sock.bind((self.host, self.port))
+
+            # Register the socket with the selector directly; the reader
+            # callback drains a whole burst of datagrams per wake-up
+            # rather than paying a loop dispatch per packet.
+            loop.add_reader(sock.fileno(), self._drain)
+            self._sock = sock
+            self._loop = loop
+
             self._running = True
             _LOGGER.info("Syslog server started on %s:%d", self.host, self.port)
-            
+
         except Exception as err:
             _LOGGER.error("Failed to start syslog server: %s", err)
             raise
 
+    def _drain(self):
+        """Drain pending datagrams from the socket (reader callback).
+
+        Pulls up to _DRAIN_BATCH packets per wake-up so a burst is
+        handled in one callback; the cap keeps a sustained flood from
+        starving other event-loop work.
+        """
+        sock = self._sock
+        recvfrom = sock.recvfrom
+        handle = self.callback
+        for _ in range(_DRAIN_BATCH):
+            try:
+                raw, addr = recvfrom(_RECV_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as err:
+                _LOGGER.error("Syslog socket error: %s", err)
+                break
+            try:
+                message = raw.decode("utf-8", errors="ignore").strip()
+                if not message:
+                    continue
+                handle(_parse_syslog(message, addr[0]))
+            except Exception as err:
+                _LOGGER.error(
+                    "Error processing syslog message from %s: %s", addr[0], err
+                )
+
     async def stop(self):
         """Stop the syslog server."""
-        if self.transport:
-            self.transport.close()
+        if self._sock:
+            if self._loop is not None:
+                self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
             self._running = False
             _LOGGER.info("Syslog server stopped")
 
@@ -54,122 +189,3 @@ class SyslogServer:
     def is_running(self) -> bool:
         """Check if server is running."""
         return self._running
-
-
-class SyslogProtocol(asyncio.DatagramProtocol):
-    """Protocol handler for syslog messages."""
-
-    def __init__(self, callback: Callable):
-        """Initialize protocol handler."""
-        self.callback = callback
-        super().__init__()
-
-    def connection_made(self, transport):
-        """Handle connection made."""
-        self.transport = transport
-
-    def datagram_received(self, data: bytes, addr: tuple):
-        """Handle received syslog message.
-        
-        Args:
-            data: Raw syslog message bytes
-            addr: Source address (ip, port)
-        """
-        try:
-            message = data.decode('utf-8', errors='ignore').strip()
-            
-            if not message:
-                return
-            
-            # Parse basic syslog format
-            syslog_data = self._parse_syslog(message, addr[0])
-            
-            # Call the callback with parsed data
-            asyncio.create_task(self.callback(syslog_data))
-            
-        except Exception as err:
-            _LOGGER.error("Error processing syslog message from %s: %s", addr[0], err)
-
-    def _parse_syslog(self, message: str, source_ip: str) -> dict:
-        """Parse syslog message into structured data.
-        
-        RFC 3164 format: <PRI>TIMESTAMP HOSTNAME TAG: MESSAGE
-        RFC 5424 format: <PRI>VERSION TIMESTAMP HOSTNAME APP-NAME PROCID MSGID SD MESSAGE
-        
-        Args:
-            message: Raw syslog message
-            source_ip: Source IP address
-            
-        Returns:
-            Dictionary with parsed syslog data
-        """
-        data = {
-            "raw_message": message,
-            "source_ip": source_ip,
-            "timestamp": datetime.now(),
-            "facility": None,
-            "severity": None,
-            "hostname": None,
-            "tag": None,
-            "message": message,
-        }
-        
-        try:
-            # Parse priority (PRI) if present
-            if message.startswith('<'):
-                pri_end = message.find('>')
-                if pri_end > 0:
-                    pri = int(message[1:pri_end])
-                    data["facility"] = pri >> 3
-                    data["severity"] = pri & 0x07
-                    message = message[pri_end + 1:].strip()
-            
-            # Try to parse RFC 3164 format
-            parts = message.split(None, 3)
-            
-            if len(parts) >= 3:
-                # parts[0] = timestamp (often), parts[1] = hostname, parts[2+] = tag/message
-                # Simple heuristic: if second part looks like hostname
-                if self._looks_like_hostname(parts[1]):
-                    data["hostname"] = parts[1]
-                    
-                    if len(parts) >= 3:
-                        # Check for tag (before colon)
-                        tag_msg = ' '.join(parts[2:])
-                        if ':' in tag_msg:
-                            tag, msg = tag_msg.split(':', 1)
-                            data["tag"] = tag.strip()
-                            data["message"] = msg.strip()
-                        else:
-                            data["message"] = tag_msg
-                else:
-                    data["hostname"] = source_ip
-                    data["message"] = ' '.join(parts[1:])
-            
-        except Exception as err:
-            _LOGGER.debug("Error parsing syslog structure: %s", err)
-            # Keep raw message as fallback
-        
-        return data
-
-    def _looks_like_hostname(self, text: str) -> bool:
-        """Check if text looks like a hostname or IP."""
-        if not text:
-            return False
-        
-        # Check for IP address pattern
-        parts = text.split('.')
-        if len(parts) == 4 and all(p.isdigit() and 0 <= int(p) <= 255 for p in parts):
-            return True
-        
-        # Check for hostname pattern (alphanumeric, hyphens, dots)
-        return all(c.isalnum() or c in '.-_' for c in text)
-
-    def error_received(self, exc):
-        """Handle error."""
-        _LOGGER.error("Syslog protocol error: %s", exc)
-
-    def connection_lost(self, exc):
-        """Handle connection lost."""
-        if exc:
-            _LOGGER.error("Syslog connection lost: %s", exc)
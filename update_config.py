@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
 """Update SIEM configuration to 50k events and 30 days retention."""
-import json
+import os
+import tempfile
+
+try:
+    import orjson as _json
+
+    def _loads(raw):
+        return _json.loads(raw)
+
+    def _dumps(config):
+        return _json.dumps(config, option=_json.OPT_INDENT_2)
+
+except ImportError:  # orjson ships with HA, but keep the script standalone
+    import json as _json
+
+    def _loads(raw):
+        return _json.loads(raw)
+
+    def _dumps(config):
+        return _json.dumps(config, indent=2).encode()
+
+CONFIG_PATH = '/config/.storage/core.config_entries'
 
 # Load config
-with open('/config/.storage/core.config_entries', 'r') as f:
-    config = json.load(f)
+with open(CONFIG_PATH, 'rb') as f:
+    config = _loads(f.read())
 
 # Find and update SIEM entry
 for entry in config['data']['entries']:
@@ -16,8 +37,18 @@ for entry in config['data']['entries']:
         print(f"  retention_days: {entry['data']['retention_days']}")
         break
 
-# Save back
-with open('/config/.storage/core.config_entries', 'w') as f:
-    json.dump(config, f, indent=2)
+# Save back atomically: write a temp file in the same directory and
+# os.replace it over the original, so a crash mid-write can't leave a
+# truncated core.config_entries behind.
+fd, tmp_path = tempfile.mkstemp(
+    dir=os.path.dirname(CONFIG_PATH), prefix='.core.config_entries.'
+)
+try:
+    with os.fdopen(fd, 'wb') as f:
+        f.write(_dumps(config))
+    os.replace(tmp_path, CONFIG_PATH)
+except BaseException:
+    os.unlink(tmp_path)
+    raise
 
 print('Config updated successfully!')